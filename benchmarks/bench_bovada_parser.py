@@ -0,0 +1,51 @@
+"""Parse time per Bovada page: lxml coupon parser against the old BeautifulSoup token split.
+
+    python -m benchmarks.bench_bovada_parser                 # every recorded bovada snapshot
+    python -m benchmarks.bench_bovada_parser --file page.html --runs 20
+"""
+import argparse
+import time
+from bs4 import BeautifulSoup
+from utils.bovada import parse_coupons
+from utils.snapshots import list_snapshots, load_snapshot
+
+def legacy_parse(html):
+    """The original html.parser + str(section).split('>') tokenizer."""
+    soup = BeautifulSoup(html, "html.parser")
+    data = []
+    for game in soup.find_all("section", {"class": "coupon-content more-info"}):
+        item = str(game).split('>')
+        data.append([x.split('<')[0].strip() for x in item if not x.startswith("<")])
+    return data
+
+def best_of(fn, html, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn(html)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--file', help='a saved Bovada page source; defaults to recorded snapshots')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            pages = [(args.file, f.read())]
+    else:
+        pages = [(path, load_snapshot(path)[1]) for path in list_snapshots('bovada')]
+    if not pages:
+        print("No Bovada pages to parse; record some with RECORD_SNAPSHOTS=1 or pass --file")
+        return
+
+    for name, html in pages:
+        legacy_time, legacy_rows = best_of(legacy_parse, html, args.runs)
+        lxml_time, records = best_of(parse_coupons, html, args.runs)
+        print(f"{name}: {len(records)} games | html.parser {legacy_time * 1000:.1f} ms | "
+              f"lxml {lxml_time * 1000:.1f} ms | {legacy_time / lxml_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Odds transform (parsed coupons -> ranked table): vectorized pipeline against the old row-wise one.
+
+    python -m benchmarks.bench_get_data                 # recorded bovada snapshots, else synthetic boards
+    python -m benchmarks.bench_get_data --games 16 --runs 50
+
+Timing only; tests/test_get_data.py checks get_data against the original pipeline.
+"""
+import argparse
+import hashlib
+import random
+import time
+import pandas as pd
+from utils.bovada import parse_coupons, COUPON_FIELDS
+from utils.snapshots import list_snapshots, load_snapshot
+from utils.helper_functions import coupons_to_frame, concat_values
+
+def legacy_convert_to_int(value):
+    """convert_to_int without its per-cell traceback logging."""
+    try:
+        if value == 'EVEN':
+            return 0
+        if value.startswith('+'):
+            return int(value[1:])
+        return int(value)
+    except Exception:
+        return -1
+
+def legacy_transform(records, start_date, end_date):
+    """The original apply/iterrows pipeline, starting from the same parsed coupons."""
+    df = pd.DataFrame(records, columns=COUPON_FIELDS)
+    df["home_spread"] = df.apply(lambda row: concat_values(row["home_spread_line"], row["home_spread_price"]), axis=1)
+    df["away_spread"] = df.apply(lambda row: concat_values(row["away_spread_line"], row["away_spread_price"]), axis=1)
+    df["total_over"] = df.apply(lambda row: concat_values(row["over_side"], row["over_line"], row["over_price"]), axis=1)
+    df["total_under"] = df.apply(lambda row: concat_values(row["under_side"], row["under_line"], row["under_price"]), axis=1)
+    df = df[["date", "time", "bets", "home_team", "away_team", "home_win", "away_win", "home_spread", "away_spread", "total_over", "total_under"]]
+    start_date = pd.Timestamp(start_date)
+    end_date = pd.Timestamp(end_date)
+    df = df.assign(date=pd.to_datetime(df['date']))
+    df = df[(df['date'] >= start_date) & (df['date'] <= end_date)].copy()
+    df["day"] = df['date'].dt.strftime('%A')
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    df.reset_index(inplace=True, drop=True)
+    df['home_win'] = df['home_win'].apply(legacy_convert_to_int)
+    df["away_win"] = df["away_win"].apply(legacy_convert_to_int)
+    home = df[["home_team", 'home_win']].rename(columns={'home_team': 'team', 'home_win': 'odds'})
+    away = df[['away_team', "away_win"]].rename(columns={'away_team': 'team', "away_win": 'odds'})
+    combined = pd.concat([home, away]).sort_values('odds', ascending=False)
+    combined['index'] = combined.index
+    combined.index = range(0, 2 * len(combined), 2)
+    df['points'] = None
+    for i, x in combined.iterrows():
+        df.at[x['index'], 'points'] = (i - len(combined)) / 2
+    current_df = df.sort_values('points', ascending=False)
+    current_df["game_id"] = current_df.apply(
+        lambda row: hashlib.md5(f"{row['date']}_{row['home_team']}_{row['away_team']}".encode()).hexdigest(), axis=1)
+    return current_df[['date', 'day', 'time', 'bets', 'home_team', 'away_team', 'points', 'home_win', 'away_win',
+                       'home_spread', 'away_spread', 'total_over', 'total_under', 'game_id']]
+
+def synthetic_board(games, date='2024-11-24'):
+    """Coupons shaped like a real board, including the values the old converter choked on."""
+    prices = ['-110', '-105', '+100', 'EVEN', '-120']
+    records = []
+    for g in range(games):
+        favourite = random.randint(105, 400)
+        record = dict.fromkeys(COUPON_FIELDS)
+        record.update(date=date, time='1:00 PM', bets=str(random.randint(10, 500)),
+                      home_team=f"Home {g}", away_team=f"Away {g}",
+                      home_win=f"-{favourite}", away_win=random.choice([f"+{favourite - 20}", 'EVEN', 'O']),
+                      home_spread_line='-3.5', home_spread_price=random.choice(prices),
+                      away_spread_line='+3.5', away_spread_price=random.choice(prices))
+        if g % 5:
+            record.update(over_side='O', over_line='47.5', over_price='-110',
+                          under_side='U', under_line='47.5', under_price='-110')
+        records.append(record)
+    return records
+
+def best_of(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--start', default='2000-01-01')
+    parser.add_argument('--end', default='2100-01-01')
+    args = parser.parse_args()
+
+    inputs = [(path, parse_coupons(load_snapshot(path)[1])) for path in list_snapshots('bovada')]
+    inputs += [(f"synthetic {games} games", synthetic_board(games)) for games in args.games]
+
+    for name, records in inputs:
+        old_time, _ = best_of(lambda: legacy_transform(records, args.start, args.end), args.runs)
+        new_time, _ = best_of(lambda: coupons_to_frame(records, args.start, args.end), args.runs)
+        print(f"{name}: row-wise {old_time * 1000:.2f} ms | vectorized {new_time * 1000:.2f} ms | "
+              f"{old_time / new_time:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""load_historical_data at 10k, 100k and 1M nfl_data rows: vectorized against the old iterrows loop.
+
+    python -m benchmarks.bench_historical
+    python -m benchmarks.bench_historical --rows 10000 100000 --runs 3
+
+Each size is built in a throwaway database (DB_PATH is pointed at a temp file).
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ['DB_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench.db')
+
+import pandas as pd
+from utils.db import get_connection
+from utils.migrations import migrate_database
+from utils.helper_functions import load_historical_data
+
+def legacy_load(start_date, end_date):
+    """The original iterrows implementation."""
+    query = '''
+    SELECT datetime, game_id, date, home_team, away_team, home_win, away_win, points
+    FROM nfl_data
+    WHERE datetime BETWEEN ? AND ?
+    '''
+    df = pd.read_sql_query(query, get_connection(), params=(f'{start_date} 00:00:00', f'{end_date} 00:00:00'))
+    plot_data = []
+    for _, row in df.iterrows():
+        if row['home_win'] < row['away_win']:
+            home_points, away_points = row['points'], -row['points']
+        else:
+            home_points, away_points = -row['points'], row['points']
+        plot_data.append({'DateTime': row['datetime'], 'Team': row['home_team'], 'Win': row['home_win'],
+                          'Type': 'Home Win', 'points': home_points})
+        plot_data.append({'DateTime': row['datetime'], 'Team': row['away_team'], 'Win': row['away_win'],
+                          'Type': 'Away Win', 'points': away_points})
+    return pd.DataFrame(plot_data)
+
+def fill(rows, games=16, start=datetime(2024, 9, 3)):
+    """Insert `rows` snapshots of `games` games spread evenly over a season."""
+    conn = get_connection()
+    conn.execute("DELETE FROM nfl_data")
+    step = timedelta(days=140) / rows
+    teams = [f"Team {n}" for n in range(2 * games)]
+    data = []
+    for i in range(rows):
+        g = i % games
+        home_win = random.choice([-300, -150, -110, 100, 130, 250])
+        data.append(((start + i * step).isoformat(), f"game{g}", start.strftime('%Y-%m-%d'),
+                     teams[2 * g], teams[2 * g + 1], home_win, -home_win, float(random.randint(-16, 16))))
+    with conn:
+        conn.executemany("INSERT INTO nfl_data VALUES (?, ?, ?, ?, ?, ?, ?, ?)", data)
+
+def best_of(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--skip-legacy-above', type=int, default=100_000,
+                        help='the iterrows loop takes minutes at 1M rows')
+    args = parser.parse_args()
+
+    migrate_database()
+    start_date, end_date = '2024-09-01', '2025-02-01'
+    for rows in args.rows:
+        fill(rows)
+        new_time, new_df = best_of(lambda: load_historical_data(start_date, end_date), args.runs)
+        line = f"{rows:>9} rows | vectorized {new_time:.3f}s, {new_df.memory_usage(deep=True).sum() / 2**20:.1f} MiB"
+        if rows <= args.skip_legacy_above:
+            old_time, old_df = best_of(lambda: legacy_load(start_date, end_date), 1)
+            line += (f" | iterrows {old_time:.3f}s, {old_df.memory_usage(deep=True).sum() / 2**20:.1f} MiB"
+                     f" | {old_time / new_time:.0f}x")
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Time-to-parse for the old fixed-sleep page load against readiness-driven loading.
+
+Serves local static copies of the scraped pages and loads each one through a
+warm pooled driver in both modes:
+
+    python -m benchmarks.bench_page_load --pages path/to/pages --runs 3
+
+`--pages` must contain bovada.html and/or espn.html (saved page sources).
+"""
+import argparse
+import functools
+import http.server
+import os
+import threading
+import time
+from bs4 import BeautifulSoup
+from utils.driver_pool import DriverPool, load_page
+from utils.helper_functions import BOVADA_READY_SELECTOR, ESPN_READY_SELECTOR
+
+PAGES = {
+    'bovada.html': BOVADA_READY_SELECTOR,
+    'espn.html': ESPN_READY_SELECTOR,
+}
+
+def serve(directory):
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def time_to_parse(pool, url, selector, mode):
+    started = time.perf_counter()
+    with pool.driver() as driver:
+        html = load_page(driver, url, selector, mode=mode)
+    BeautifulSoup(html, "html.parser")
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', required=True, help='directory holding bovada.html / espn.html')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    server = serve(os.path.abspath(args.pages))
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        for block_resources, mode in [(False, 'sleep'), (True, 'ready')]:
+            pool = DriverPool(size=1, block_resources=block_resources)
+            try:
+                for page, selector in PAGES.items():
+                    if not os.path.exists(os.path.join(args.pages, page)):
+                        continue
+                    # Warm the driver so browser startup is not counted
+                    time_to_parse(pool, f"{base}/{page}", selector, 'ready')
+                    timings = [time_to_parse(pool, f"{base}/{page}", selector, mode) for _ in range(args.runs)]
+                    print(f"{page:12} mode={mode:5} blocked={block_resources!s:5} "
+                          f"best={min(timings):.3f}s mean={sum(timings) / len(timings):.3f}s")
+            finally:
+                pool.close()
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Cost of one Bovada refresh through the http adapter: cold GET, keep-alive GET and conditional 304.
+
+    python -m benchmarks.bench_sources                 # against the local stand-in server
+    python -m benchmarks.bench_sources --games 64 --runs 50
+
+Each refresh is fetch plus parse (coupons to the ranked table); an unchanged
+page skips the parse, as get_data does.
+"""
+import argparse
+import time
+import urllib3
+from benchmarks.standin_server import serve
+from utils.sources import HttpSource
+from utils.helper_functions import parse_bovada_page
+
+def refresh(source):
+    page = source.fetch()
+    if page.changed:
+        parse_bovada_page(page.html, '2000-01-01', '2100-01-01')
+    return page
+
+def best_of(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=16)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    server = serve(synthetic_games=args.games)
+    url = f"http://127.0.0.1:{server.server_port}/bovada"
+
+    def cold():
+        # new connection and no validators: what every refresh cost before
+        refresh(HttpSource('bovada', url, pool=urllib3.PoolManager(maxsize=1)))
+
+    pool = urllib3.PoolManager(maxsize=1)
+    def keep_alive():
+        refresh(HttpSource('bovada', url, pool=pool))
+
+    conditional_source = HttpSource('bovada', url, pool=pool)
+    refresh(conditional_source)
+    def conditional():
+        assert not refresh(conditional_source).changed
+
+    results = {name: best_of(fn, args.runs) for name, fn in
+               [('cold GET + parse', cold), ('keep-alive GET + parse', keep_alive), ('conditional 304', conditional)]}
+    for name, seconds in results.items():
+        print(f"{name}: {seconds * 1000:.2f} ms")
+    print(f"stats: {conditional_source.stats()}")
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
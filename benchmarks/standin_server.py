@@ -0,0 +1,134 @@
+"""Local stand-in for the scraped sites, serving recorded pages with HTTP validators.
+
+    python -m benchmarks.standin_server --port 8765               # latest recorded snapshot per source
+    python -m benchmarks.standin_server --advance 30              # step through the snapshots every 30 s
+
+    BOVADA_ADAPTER=http BOVADA_URL=http://127.0.0.1:8765/bovada python ingest.py
+
+GET /<source> returns the current page for that source with an ETag and
+Last-Modified, and answers If-None-Match / If-Modified-Since with 304 when the
+page has not moved on. Without recorded Bovada snapshots a synthetic board
+is served instead. Connections are kept alive (HTTP/1.1).
+"""
+import argparse
+import hashlib
+import http.server
+import random
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from config import SNAPSHOT_DIR
+from utils.snapshots import list_snapshots, load_snapshot
+
+def synthetic_bovada_page(games=16, date='11/24/2024', seed=0):
+    """A Bovada NFL board in the markup utils/bovada.py parses."""
+    rng = random.Random(seed)
+    coupons = []
+    for g in range(games):
+        favourite = rng.randint(105, 400)
+        coupons.append(f"""
+<section class="coupon-content more-info">
+  <span class="period">{date}</span><span class="clock">1:00 PM</span><a class="bets">+ {rng.randint(10, 500)}</a>
+  <h4 class="competitor-name"><span class="name">Home {g}</span></h4>
+  <h4 class="competitor-name"><span class="name">Away {g}</span></h4>
+  <sp-two-way-vertical><span>-3.5</span><span>-110</span><span>+3.5</span><span>-110</span></sp-two-way-vertical>
+  <sp-two-way-vertical><span>-{favourite}</span><span>+{favourite - 20}</span></sp-two-way-vertical>
+  <sp-two-way-vertical><span>O</span><span>47.5</span><span>-110</span><span>U</span><span>47.5</span><span>-110</span></sp-two-way-vertical>
+</section>""")
+    return f"<html><body><main>{''.join(coupons)}</main></body></html>"
+
+class Pages:
+    """The pages served per source, optionally stepping to the next snapshot every `advance` seconds."""
+
+    def __init__(self, directory=SNAPSHOT_DIR, advance=None, synthetic_games=16):
+        self.advance = advance
+        self.started = time.monotonic()
+        self.synthetic_games = synthetic_games
+        self.snapshots = {source: list_snapshots(source, directory) for source in ('bovada', 'espn')}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def current(self, source):
+        """(body, etag, last_modified timestamp) for a source, or None if unknown."""
+        paths = self.snapshots.get(source)
+        if paths is None or (not paths and source != 'bovada'):
+            return None
+        step = int((time.monotonic() - self.started) // self.advance) if self.advance else None
+        if paths:
+            key = paths[step % len(paths)] if step is not None else paths[-1]
+        else:
+            key = step or 0
+        with self._lock:
+            if key not in self._cache:
+                if paths:
+                    taken_at, html = load_snapshot(key)
+                    modified = taken_at.timestamp()
+                else:
+                    html = synthetic_bovada_page(self.synthetic_games, seed=key)
+                    modified = time.time()
+                body = html.encode('utf-8')
+                self._cache[key] = (body, f'"{hashlib.md5(body).hexdigest()}"', modified)
+            return self._cache[key]
+
+class StandinHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    pages = None
+
+    def do_GET(self):
+        page = self.pages.current(self.path.strip('/').split('?')[0])
+        if page is None:
+            self.send_error(404)
+            return
+        body, etag, modified = page
+        if self._not_modified(etag, modified):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', formatdate(modified, usegmt=True))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag, modified):
+        if 'If-None-Match' in self.headers:
+            return etag in [tag.strip() for tag in self.headers['If-None-Match'].split(',')]
+        since = self.headers.get('If-Modified-Since')
+        if since:
+            try:
+                return int(modified) <= parsedate_to_datetime(since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(port=0, directory=SNAPSHOT_DIR, advance=None, synthetic_games=16):
+    """Start the stand-in on a background thread; returns the server (its port is server.server_port)."""
+    handler = type('Handler', (StandinHandler,), {'pages': Pages(directory, advance, synthetic_games)})
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--directory', default=SNAPSHOT_DIR)
+    parser.add_argument('--advance', type=float, help='seconds before moving on to the next snapshot')
+    parser.add_argument('--games', type=int, default=16, help='games on the synthetic board')
+    args = parser.parse_args()
+    server = serve(args.port, args.directory, args.advance, args.games)
+    print(f"Serving on http://127.0.0.1:{server.server_port}/bovada and /espn")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,68 @@
 from app import app
 from logger import setup_logger
-from dash import Output, Input, State, html
+from dash import Output, Input, State, html, no_update, Patch
 from flask import request
-import sqlite3
-from itertools import groupby
 import pandas as pd
 import plotly.express as px
 from utils.helper_functions import *
+from config import CHAT_WINDOW
+from utils.chat_writer import chat_limiter
+from utils.providers import odds_table, matchups, history, expert_picks
+from utils.metrics import timed
 
 logger = setup_logger(__name__)
 
-# Callback to display chat messages
+def chat_line(msg):
+    return html.Div(f"{msg[2]}: {msg[3]}", style={"color": msg[2].split('-')[1]})
+
+# Callback to display chat messages: the first poll renders the latest window,
+# later polls only append messages newer than the last one on screen
+@app.callback(
+    Output('chat-messages', 'children'),
+    Output('chat-state', 'data'),
+    Input('chat-interval', 'n_intervals'),
+    State('chat-state', 'data')
+)
+@timed('callback.update_chat')
+def update_chat(n, state):
+    if not state:
+        messages = read_chat_log()
+        return [chat_line(msg) for msg in messages], {'ids': [msg[0] for msg in messages], 'limit': CHAT_WINDOW}
+
+    ids = state['ids']
+    messages = read_chat_log(after_id=ids[-1] if ids else 0, limit=state['limit'])
+    if not messages:
+        return no_update, no_update
+
+    patched = Patch()
+    patched.extend([chat_line(msg) for msg in messages])
+    ids = ids + [msg[0] for msg in messages]
+    # Drop the oldest lines so the window stays bounded
+    for _ in range(len(ids) - state['limit']):
+        del patched[0]
+    return patched, {'ids': ids[-state['limit']:], 'limit': state['limit']}
+
+# Callback to page in older chat messages above the current window
 @app.callback(
-    Output('chat-box', 'children'),
-    Input('chat-interval', 'n_intervals')
+    Output('chat-messages', 'children', allow_duplicate=True),
+    Output('chat-state', 'data', allow_duplicate=True),
+    Input('chat-load-older', 'n_clicks'),
+    State('chat-state', 'data'),
+    prevent_initial_call=True
 )
-def update_chat(n):
-    messages = read_chat_log()
-    return [html.Div(f"{msg[2]}: {msg[3]}", style={"color": msg[2].split('-')[1]}) for msg in messages]
+@timed('callback.load_older_chat')
+def load_older_chat(n_clicks, state):
+    if not state or not state['ids']:
+        return no_update, no_update
+    messages = read_chat_before(state['ids'][0])
+    if not messages:
+        return no_update, no_update
+
+    patched = Patch()
+    for msg in reversed(messages):
+        patched.prepend(chat_line(msg))
+    # Widen the window so the next poll does not trim the page just loaded
+    return patched, {'ids': [msg[0] for msg in messages] + state['ids'], 'limit': state['limit'] + len(messages)}
 
 # Callback to send a new chat message
 @app.callback(
@@ -26,71 +71,124 @@ def update_chat(n):
     State('chat-message', 'value'),
     prevent_initial_call=True
 )
+@timed('callback.send_message')
 def send_message(n_clicks, n_submit, message):
     if n_clicks or n_submit:
         if message != ''.strip():
             ip_address = request.remote_addr  # Get user IP address
-            username = get_username_by_ip(ip_address)
-            if not username:
-                username = generate_username(ip_address)
+            if not chat_limiter.allow(ip_address):
+                logger.warning(f"Chat rate limit hit for {ip_address}")
+                return message  # Keep the text so it can be sent again
+            username = username_for_ip(ip_address)
             append_message_to_log(ip_address, username, message)
             return ''  # Clear input field after sending message
         return ''
     return message
 
+# Each output refreshes on its own cadence from the shared providers, so a failure
+# in one leaves the others (and what is already on screen) alone
+
+def refresh_history_graph(kind, start_date, end_date, state):
+    try:
+        # Shared across clients; only rebuilt or extended when nfl_data grows
+        with timed('history.frame'):
+            historical_data = history(start_date, end_date)
+        if historical_data is None:
+            return no_update, no_update
+        # Only patched with the points it has not seen yet
+        with timed(f'figure.{kind}'):
+            fig, state = refresh_figure(kind, historical_data, state, start_date, end_date)
+        logger.info(f"{kind.capitalize()} Graph updated")
+        return fig, state
+    except Exception as e:
+        logger.exception(f"ERROR updating {kind} graph")
+        return no_update, no_update
+
 @app.callback(
     Output('picks-graph', 'figure'),
+    Output('picks-graph-state', 'data'),
+    Input('interval-component', 'n_intervals'),
+    Input('date-picker-range', 'start_date'),
+    Input('date-picker-range', 'end_date'),
+    State('picks-graph-state', 'data')
+)
+@timed('callback.update_picks_graph')
+def update_picks_graph(n, start_date, end_date, state):
+    return refresh_history_graph('picks', start_date, end_date, state)
+
+@app.callback(
+    Output('lower-odds-points-graph', 'figure'),
+    Output('points-graph-state', 'data'),
+    Input('interval-component', 'n_intervals'),
+    Input('date-picker-range', 'start_date'),
+    Input('date-picker-range', 'end_date'),
+    State('points-graph-state', 'data')
+)
+@timed('callback.update_points_graph')
+def update_points_graph(n, start_date, end_date, state):
+    return refresh_history_graph('points', start_date, end_date, state)
+
+@app.callback(
+    Output('odds-graph', 'figure'),
+    Output('odds-graph-state', 'data'),
+    Input('interval-component', 'n_intervals'),
+    Input('date-picker-range', 'start_date'),
+    Input('date-picker-range', 'end_date'),
+    State('odds-graph-state', 'data')
+)
+@timed('callback.update_odds_graph')
+def update_odds_graph(n, start_date, end_date, state):
+    return refresh_history_graph('odds', start_date, end_date, state)
+
+@app.callback(
     Output('data-table', 'data'),
     Output('data-table', 'tooltip_data'),
+    Input('interval-component', 'n_intervals'),
+    Input('date-picker-range', 'start_date'),
+    Input('date-picker-range', 'end_date')
+)
+@timed('callback.update_odds_table')
+def update_odds_table(n, start_date, end_date):
+    try:
+        # Latest snapshot persisted by the ingestion worker (ingest.py)
+        table = odds_table(start_date, end_date)
+        if table is None:
+            return no_update, no_update
+        records, tooltip_data = table
+        logger.info("Table updated")
+        return records, tooltip_data
+    except Exception as e:
+        logger.exception("ERROR updating odds table")
+        return no_update, no_update
+
+@app.callback(
     Output('matchups-table', 'data'),
-    Output('lower-odds-points-graph', 'figure'),
-    Output('odds-graph', 'figure'),
-    Output('expert-table', 'data'),
     Input('interval-component', 'n_intervals'),
     Input('date-picker-range', 'start_date'),
     Input('date-picker-range', 'end_date')
 )
-def update_all(n, start_date, end_date):
-    #graphs and things
-    historical_data = load_historical_data(start_date, end_date)
-    picks_fig = generate_picks_graph(historical_data, start_date, end_date)
-    logger.info(f"Picks Graph updated")
-    
-    points_fig = generate_points_graph(historical_data, start_date, end_date)
-    logger.info(f"Points Graph updated")
-    odds_fig = generate_odds_graph(historical_data, start_date, end_date)
-    logger.info(f"Odds Graph updated")
-    # Fetch the latest data using the get_data function
-    df = get_data(start_date, end_date)
-    df_display = df.drop(columns=['game_id'])
-    matchup_tbl = generate_matchups(df)
-    #generate expert picks table
-    expert_tbl = get_espn_expert_data()
-
-    # Connect to SQLite database to get historical data
-    with sqlite3.connect('data-log.db') as conn:
-        # Prepare tooltip data
-        tooltip_data = []
-        for index, row in df.iterrows():
-            game_id = row['game_id']
-            hist_query = f"SELECT * FROM nfl_data WHERE game_id = '{game_id}' ORDER BY datetime DESC"
-            hist_df = pd.read_sql_query(hist_query, conn)
-            row_tooltip = {}
-            for col in ['home_win', 'away_win', 'points']:
-                if col in df.columns:
-                    current_value = row[col]
-                    history = hist_df[col].tolist()
-                    distinct_changes = [str(k) for k, g in groupby(history) if str(k) != str(current_value)]
-
-                    row_tooltip[col] = f"{col}: {str(current_value)}"
-                    if distinct_changes:
-                        row_tooltip[col] += f"\nHistory: {', '.join(distinct_changes)}"
-                    else:
-                        row_tooltip[col] += "\nHistory: No changes"
-
-            tooltip_data.append(row_tooltip)
-
-
-    # Update the data and tooltips for the table
-    logger.info("Table updated")
-    return picks_fig, df_display.to_dict('records'), tooltip_data, matchup_tbl, points_fig, odds_fig, expert_tbl.to_dict('records')
+@timed('callback.update_matchups_table')
+def update_matchups_table(n, start_date, end_date):
+    try:
+        matchups_tbl = matchups(start_date, end_date)
+        if matchups_tbl is None:
+            return no_update
+        return matchups_tbl
+    except Exception as e:
+        logger.exception("ERROR updating matchups table")
+        return no_update
+
+@app.callback(
+    Output('expert-table', 'data'),
+    Input('expert-interval', 'n_intervals')
+)
+@timed('callback.update_expert_table')
+def update_expert_table(n):
+    try:
+        expert_tbl = expert_picks()
+        if expert_tbl is None:
+            return no_update
+        return expert_tbl.to_dict('records')
+    except Exception as e:
+        logger.exception("ERROR updating expert table")
+        return no_update
@@ -0,0 +1,88 @@
+# config.py
+import os
+
+# Seconds between scrapes in the ingestion worker (ingest.py)
+INGEST_INTERVAL = int(os.environ.get('INGEST_INTERVAL', 60))
+# Port the ingestion worker serves /metrics on (the dashboard serves it on its own port); 0 turns it off
+METRICS_PORT = int(os.environ.get('METRICS_PORT', 9101))
+
+# Number of warm headless Chrome instances kept by the driver pool
+DRIVER_POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', 2))
+# Pages a driver may load before it is recycled
+DRIVER_MAX_PAGES = int(os.environ.get('DRIVER_MAX_PAGES', 50))
+
+# Seconds a single scrape source may run before the orchestrator gives up on it
+SCRAPE_TIMEOUT = int(os.environ.get('SCRAPE_TIMEOUT', 45))
+
+# 'ready' waits for the selectors each parser needs; 'sleep' is the old fixed 10 s wait
+PAGE_LOAD_MODE = os.environ.get('PAGE_LOAD_MODE', 'ready')
+# Seconds to wait for a page's ready selector before parsing whatever has rendered
+PAGE_LOAD_TIMEOUT = int(os.environ.get('PAGE_LOAD_TIMEOUT', 20))
+# Block images, fonts, stylesheets and trackers in the scraping browsers
+BLOCK_RESOURCES = os.environ.get('BLOCK_RESOURCES', '1') == '1'
+
+# Save every fetched page source as a compressed snapshot (see utils/snapshots.py)
+RECORD_SNAPSHOTS = os.environ.get('RECORD_SNAPSHOTS', '0') == '1'
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', 'snapshots')
+
+# SQLite database shared by the dashboard, chat and ingestion worker
+DB_PATH = os.environ.get('DB_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data-log.db'))
+# Milliseconds a connection waits on a lock before raising "database is locked"
+DB_BUSY_TIMEOUT = int(os.environ.get('DB_BUSY_TIMEOUT', 5000))
+# Idle connections kept for reuse by new request threads (see utils/db.py)
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+
+# Most recent chat messages kept on screen, and how many "Load older" fetches per click
+CHAT_WINDOW = int(os.environ.get('CHAT_WINDOW', 50))
+CHAT_PAGE_SIZE = int(os.environ.get('CHAT_PAGE_SIZE', 25))
+# Newest chat messages held in memory for polls (see utils/chat_cache.py)
+CHAT_CACHE_SIZE = int(os.environ.get('CHAT_CACHE_SIZE', 200))
+
+# Chat write-behind: flush after this many queued messages or this many seconds
+CHAT_BATCH_SIZE = int(os.environ.get('CHAT_BATCH_SIZE', 50))
+CHAT_FLUSH_INTERVAL = float(os.environ.get('CHAT_FLUSH_INTERVAL', 0.25))
+# Messages waiting to be written before new ones are dropped
+CHAT_QUEUE_MAX = int(os.environ.get('CHAT_QUEUE_MAX', 1000))
+# Per-IP token bucket: sustained messages per second and burst size
+CHAT_RATE = float(os.environ.get('CHAT_RATE', 0.5))
+CHAT_BURST = int(os.environ.get('CHAT_BURST', 5))
+
+# Date ranges whose history frame is kept in memory (see utils/history_cache.py)
+HISTORY_CACHE_SIZE = int(os.environ.get('HISTORY_CACHE_SIZE', 8))
+
+# Most points a history graph sends to the browser; flat runs are dropped first (see utils/series.py)
+GRAPH_POINT_BUDGET = int(os.environ.get('GRAPH_POINT_BUDGET', 5000))
+# Raw nfl_data rows a history range may load before it switches to the hourly, then daily rollups
+HISTORY_ROW_BUDGET = int(os.environ.get('HISTORY_ROW_BUDGET', 50000))
+
+# Seconds the shared dashboard providers reuse a result (see utils/providers.py)
+ODDS_TTL = float(os.environ.get('ODDS_TTL', 15))
+HISTORY_TTL = float(os.environ.get('HISTORY_TTL', 10))
+EXPERT_TTL = float(os.environ.get('EXPERT_TTL', 600))
+
+# Seconds a live scrape result is shared with later callers (see utils/singleflight.py)
+SCRAPE_FRESHNESS = float(os.environ.get('SCRAPE_FRESHNESS', 30))
+
+# Page source per scraper: 'selenium' renders in Chrome, 'http' does pooled conditional GETs (see utils/sources.py)
+BOVADA_ADAPTER = os.environ.get('BOVADA_ADAPTER', 'selenium')
+BOVADA_URL = os.environ.get('BOVADA_URL', 'https://www.bovada.lv/sports/football/nfl')
+ESPN_ADAPTER = os.environ.get('ESPN_ADAPTER', 'selenium')
+ESPN_URL = os.environ.get('ESPN_URL', 'https://www.espn.com/nfl/picks')
+# Keep-alive connections per host and seconds per request for the http adapter
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 4))
+HTTP_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', 15))
+
+# Log file, rotated at LOG_MAX_BYTES with LOG_BACKUPS old files kept (see logger.py).
+# Rotation is per process, so the dashboard and the ingestion worker each need their own file
+LOG_FILE = os.environ.get('LOG_FILE', 'app.log')
+INGEST_LOG_FILE = os.environ.get('INGEST_LOG_FILE', 'ingest.log')
+DASHAPP_LOG_FILE = os.environ.get('DASHAPP_LOG_FILE', 'dashapp.log')
+REPLAY_LOG_FILE = os.environ.get('REPLAY_LOG_FILE', 'replay.log')
+LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 5 * 1024 * 1024))
+LOG_BACKUPS = int(os.environ.get('LOG_BACKUPS', 3))
+# One JSON object per line instead of plain text
+LOG_JSON = os.environ.get('LOG_JSON', '0') == '1'
+# Records waiting for the writer thread before new ones are dropped
+LOG_QUEUE_MAX = int(os.environ.get('LOG_QUEUE_MAX', 10000))
+# Seconds an identical exception is logged once and then only counted
+LOG_DEDUP_WINDOW = float(os.environ.get('LOG_DEDUP_WINDOW', 60))
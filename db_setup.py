@@ -1,8 +1,10 @@
 import sqlite3
 from datetime import datetime
+from utils.db import connect
+from utils.migrations import migrate_database
 
 def create_live_chat_database():
-    conn = sqlite3.connect('data-log.db')  # This will create the database file
+    conn = connect()  # This will create the database file
     cursor = conn.cursor()
 
     # Create a table for chat messages
@@ -20,7 +22,7 @@ def create_live_chat_database():
     conn.close()
 
 def create_data_log_database():
-    conn = sqlite3.connect('data-log.db')  # This will create the database file
+    conn = connect()  # This will create the database file
     cursor = conn.cursor()
 
     # Create a table for NFL data
@@ -41,7 +43,7 @@ def create_data_log_database():
     conn.close()
 
 def insert_sample_chat(data):
-    conn = sqlite3.connect('data-log.db')
+    conn = connect()
     cursor = conn.cursor()
 
     for entry in data:
@@ -59,4 +61,5 @@ sample_data = [
 
 create_live_chat_database()
 create_data_log_database()
+migrate_database()
 insert_sample_chat(sample_data)
\ No newline at end of file
@@ -2,8 +2,21 @@
 from app import app
 from layouts import get_main_layout
 import callbacks  # This will register the callbacks
+from utils.migrations import migrate_database
+from utils.helper_functions import warm_chat_cache
+from utils.metrics import register_metrics, add_collector
+from utils.chat_writer import chat_stats
+from utils.history_cache import history_cache
+
+migrate_database()  # Bring data-log.db up to the current schema
+warm_chat_cache()
 
 app.layout = get_main_layout()
 
+# Prometheus scrape target for this process; the scrape stages are on ingest.py's METRICS_PORT
+register_metrics(app.server)
+add_collector('chat', chat_stats)
+add_collector('history_cache', history_cache.stats)
+
 if __name__ == '__main__':
     app.run_server(debug=True, host='0.0.0.0')
\ No newline at end of file
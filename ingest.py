@@ -0,0 +1,53 @@
+# ingest.py
+import time
+from functools import partial
+from logger import setup_logger, use_log_file
+from config import INGEST_INTERVAL, INGEST_LOG_FILE, METRICS_PORT
+# Before the imports below create their loggers: the dashboard process rotates LOG_FILE
+use_log_file(INGEST_LOG_FILE)
+from utils.helper_functions import get_start_end, get_data, get_espn_expert_data, save_latest_data, save_expert_data
+from utils.scrape import scrape_all
+from utils.migrations import migrate_database
+from utils.metrics import timed, add_collector, serve_metrics
+from utils.singleflight import scrape_flight
+
+logger = setup_logger(__name__)
+
+@timed('ingest')
+def ingest_once():
+    """Scrape every source once and persist the results for the dashboard."""
+    start_date, end_date = get_start_end()
+    results = scrape_all({
+        'bovada': partial(get_data, start_date, end_date),
+        'espn': get_espn_expert_data,
+    })
+
+    df = results['bovada']
+    if df is not None:
+        save_latest_data(df)
+        logger.info(f"Ingested {len(df)} games for {start_date}-{end_date}")
+
+    expert_df = results['espn']
+    if expert_df is not None:
+        save_expert_data(expert_df)
+        logger.info(f"Ingested {len(expert_df)} expert picks")
+
+def run(interval=INGEST_INTERVAL, metrics_port=METRICS_PORT):
+    """Scrape on a fixed schedule, independent of how many clients are viewing the dashboard."""
+    migrate_database()
+    # The scrape, parse and log stages run here, so this process serves its own /metrics
+    if metrics_port:
+        add_collector('scrape_flight', scrape_flight.stats)
+        serve_metrics(metrics_port)
+        logger.info(f"Serving metrics on port {metrics_port}")
+    logger.info(f"Ingestion worker started, interval {interval}s")
+    while True:
+        started = time.monotonic()
+        try:
+            ingest_once()
+        except Exception as e:
+            logger.exception("ingest")
+        time.sleep(max(0, interval - (time.monotonic() - started)))
+
+if __name__ == '__main__':
+    run()
@@ -44,9 +44,20 @@ interval = dcc.Interval(
             n_intervals=0
         )
 
+# Expert picks only change a few times a week
+expert_interval = dcc.Interval(
+            id='expert-interval',
+            interval=10*60*1000,  # 10 mins in milliseconds
+            n_intervals=0
+        )
+
 chat_layout = html.Div([
     dcc.Interval(id='chat-interval', interval=5000, n_intervals=0),
-    html.Div(id='chat-box', className='chat-box'),
+    dcc.Store(id='chat-state'),  # ids of the messages on screen and the window size
+    html.Div([
+        html.Button('Load older', id='chat-load-older', className='chat-load-older'),
+        html.Div(id='chat-messages'),
+    ], id='chat-box', className='chat-box'),
     html.Div([
         dcc.Input(id='chat-message', type='text', n_submit=0, className='chat-input'),
         html.Button('Send', id='send-button', className='chat-send')
@@ -103,15 +114,18 @@ matchups_table = dbc.Row(
     className="matchups-table"
 )
 
-points_graph = dbc.Row(dcc.Graph(id='lower-odds-points-graph'),
+points_graph = dbc.Row([dcc.Graph(id='lower-odds-points-graph'),
+                 dcc.Store(id='points-graph-state')],  # range, last point and traces on screen
             justify="center",
             className="line-graph")
 
-picks_graph = dbc.Row(dcc.Graph(id='picks-graph'),
+picks_graph = dbc.Row([dcc.Graph(id='picks-graph'),
+                 dcc.Store(id='picks-graph-state')],  # range, last point and traces on screen
             justify="center",
             className="line-graph")
 
-odds_graph = dbc.Row(dcc.Graph(id='odds-graph'),
+odds_graph = dbc.Row([dcc.Graph(id='odds-graph'),
+                 dcc.Store(id='odds-graph-state')],  # range, last point and traces on screen
             justify="center",
             className="line-graph")
 
@@ -163,6 +177,7 @@ footer = dbc.Row(
 def get_main_layout():
     layout = html.Div([
         interval, 
+        expert_interval,
         header_row,
         dbc.Row([
             dbc.Col([
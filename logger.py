@@ -1,18 +1,178 @@
 # logger.py
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+import time
+from config import LOG_FILE, LOG_MAX_BYTES, LOG_BACKUPS, LOG_JSON, LOG_QUEUE_MAX, LOG_DEDUP_WINDOW
+
+TEXT_FORMAT = '%(asctime)s [%(levelname)s] - %(message)s'
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and the traceback if any."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        if getattr(record, 'repeats', None):
+            entry['repeats'] = record.repeats
+        return json.dumps(entry)
+
+class DuplicateExceptionFilter(logging.Filter):
+    """Collapse identical exceptions into one record per `window` seconds.
+
+    Exceptions are identical when the logger, message and exception type and
+    traceback locations match. The first one in a window is logged; the rest are
+    only counted, and the count is reported on the next one let through, so a
+    failure in a hot loop costs one traceback a minute. Windows that end with
+    repeats and no next occurrence are reported as a warning when they are
+    pruned (at most once per window, as records pass), or at shutdown.
+    """
+
+    def __init__(self, window=LOG_DEDUP_WINDOW):
+        super().__init__()
+        self.window = window
+        self._seen = {}  # key -> [window start, suppressed count, message]
+        self._pruned_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _key(self, record):
+        exc_type, exc, tb = record.exc_info
+        frames = []
+        while tb is not None:
+            frames.append((tb.tb_frame.f_code.co_filename, tb.tb_lineno))
+            tb = tb.tb_next
+        return record.name, str(record.msg), exc_type, tuple(frames)
+
+    def filter(self, record):
+        key = self._key(record) if record.exc_info and record.exc_info[0] is not None else None
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            if now - self._pruned_at >= self.window:
+                expired = self._prune(now, keep=key)
+            if key is not None:
+                seen = self._seen.get(key)
+                if seen is not None and now - seen[0] < self.window:
+                    seen[1] += 1
+                    return False
+                repeats = seen[1] if seen is not None else 0
+                self._seen[key] = [now, 0, record.getMessage()]
+        # Outside the lock: these records come back through this filter
+        for (name, *_), message, count in expired:
+            logging.getLogger(name).warning(
+                f"{message} (repeated {count} more times in the {self.window:g}s after it was logged)")
+        if key is not None and repeats:
+            record.repeats = repeats
+            record.msg, record.args = f"{record.getMessage()} (repeated {repeats} more times in the last {self.window:g}s)", None
+        return True
+
+    def _prune(self, now, keep=None):
+        """Drop windows that have ended; returns (key, message, count) for those with repeats to report.
+
+        Called with the lock held. `keep` is the exception being filtered: its
+        window stays so the record itself carries the count.
+        """
+        expired = []
+        for key, seen in list(self._seen.items()):
+            if key != keep and now - seen[0] >= self.window:
+                if seen[1]:
+                    expired.append((key, seen[2], seen[1]))
+                del self._seen[key]
+        self._pruned_at = now
+        return expired
+
+    def summaries(self):
+        """(message, count) for every exception with repeats not reported yet; resets the counts."""
+        with self._lock:
+            pending = [(seen[2], seen[1]) for seen in self._seen.values() if seen[1]]
+            for seen in self._seen.values():
+                seen[1] = 0
+        return pending
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the listener thread; never waits on the disk or a full queue."""
+
+    dropped = 0
+    _dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Same process, so the record can go as is; the listener formats the traceback
+        record.message = record.getMessage()
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with NonBlockingQueueHandler._dropped_lock:
+                NonBlockingQueueHandler.dropped += 1
+
+_handler = None
+_listener = None
+_duplicates = None
+_log_file = LOG_FILE
+_lock = threading.Lock()
+
+def use_log_file(path):
+    """Write this process's log to `path` instead of LOG_FILE; call before the first setup_logger.
+
+    RotatingFileHandler is not safe across processes: two processes rotating one
+    file lose or clobber records. index.py keeps LOG_FILE; ingest.py, dashapp.py
+    and replay.py each switch to their own (INGEST_LOG_FILE, DASHAPP_LOG_FILE,
+    REPLAY_LOG_FILE).
+    """
+    global _log_file
+    with _lock:
+        started = _handler is not None
+        if not started:
+            _log_file = path
+    if started and path != _log_file:
+        setup_logger(__name__).warning(f"Logging already started on {_log_file}, not switching to {path}")
+
+def _file_handler():
+    fh = logging.handlers.RotatingFileHandler(_log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                                              encoding='utf-8', delay=True)
+    fh.setFormatter(JsonFormatter() if LOG_JSON else logging.Formatter(TEXT_FORMAT))
+    return fh
+
+def _shutdown():
+    logger = setup_logger(__name__)
+    for message, count in _duplicates.summaries():
+        logger.warning(f"{message} (repeated {count} more times before shutdown)")
+    if NonBlockingQueueHandler.dropped:
+        logger.warning(f"{NonBlockingQueueHandler.dropped} log records dropped on a full queue")
+    _listener.stop()
+
+def _get_handler():
+    """The process-wide queue handler, starting its file listener on first use."""
+    global _handler, _listener, _duplicates
+    with _lock:
+        if _handler is None:
+            log_queue = queue.Queue(LOG_QUEUE_MAX)
+            _duplicates = DuplicateExceptionFilter()
+            _handler = NonBlockingQueueHandler(log_queue)
+            _handler.addFilter(_duplicates)
+            _listener = logging.handlers.QueueListener(log_queue, _file_handler(), respect_handler_level=True)
+            _listener.start()
+            atexit.register(_shutdown)
+        return _handler
 
 def setup_logger(name):
     """Set up a logger for a given module."""
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
 
-    # Create file handler which logs even debug messages
-    fh = logging.FileHandler('app.log')
-    formatter = logging.Formatter('%(asctime)s [%(levelname)s] - %(message)s')
-    fh.setFormatter(formatter)
-
-    # Add the handler to the logger
+    # Every module shares one queue; a background thread writes and rotates the file
     if not logger.handlers:
-        logger.addHandler(fh)
+        logger.addHandler(_get_handler())
 
-    return logger
\ No newline at end of file
+    return logger
@@ -0,0 +1,58 @@
+# replay.py
+"""Feed recorded page snapshots through the scrape pipeline without a browser or network.
+
+    python replay.py bovada --start 2024-11-19 --end 2024-11-25
+    python replay.py espn --dry-run
+
+Bovada snapshots go through the same parse/rank/log path as a live scrape, with
+rows stamped at the time the snapshot was taken, so replaying backfills
+nfl_data. --dry-run parses only and reports timings.
+"""
+import argparse
+import time
+from logger import setup_logger, use_log_file
+from config import SNAPSHOT_DIR, REPLAY_LOG_FILE
+# Before the imports below create their loggers: index.py rotates LOG_FILE
+use_log_file(REPLAY_LOG_FILE)
+from utils.snapshots import list_snapshots, load_snapshot
+from utils.helper_functions import get_start_end, get_data, get_espn_expert_data, parse_bovada_page, parse_espn_page
+
+logger = setup_logger(__name__)
+
+def replay(source, start_date, end_date, dry_run=False, directory=SNAPSHOT_DIR):
+    """Run every snapshot of `source` through the pipeline; returns parse timings in seconds."""
+    timings = []
+    for path in list_snapshots(source, directory):
+        taken_at, html = load_snapshot(path)
+        started = time.perf_counter()
+        if source == 'bovada':
+            if dry_run:
+                df = parse_bovada_page(html, start_date, end_date)
+            else:
+                df = get_data(start_date, end_date, html=html, scraped_at=taken_at)
+        else:
+            df = parse_espn_page(html) if dry_run else get_espn_expert_data(html=html)
+        timings.append(time.perf_counter() - started)
+        rows = 0 if df is None else len(df)
+        logger.info(f"Replayed {path}: {rows} rows in {timings[-1]:.3f}s")
+    return timings
+
+def main():
+    default_start, default_end = get_start_end()
+    parser = argparse.ArgumentParser(description="Replay recorded page snapshots")
+    parser.add_argument('source', choices=['bovada', 'espn'])
+    parser.add_argument('--start', default=default_start)
+    parser.add_argument('--end', default=default_end)
+    parser.add_argument('--dir', default=SNAPSHOT_DIR)
+    parser.add_argument('--dry-run', action='store_true', help='parse only, do not write to the database')
+    args = parser.parse_args()
+
+    timings = replay(args.source, args.start, args.end, args.dry_run, args.dir)
+    if timings:
+        print(f"{len(timings)} snapshots, mean {sum(timings) / len(timings) * 1000:.1f} ms, "
+              f"best {min(timings) * 1000:.1f} ms, worst {max(timings) * 1000:.1f} ms")
+    else:
+        print(f"No {args.source} snapshots in {args.dir}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+"""Point the app at a throwaway database and log file before anything imports config."""
+import os
+import sys
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix='nfl-tests-')
+os.environ['DB_PATH'] = os.path.join(_tmp, 'data-log.db')
+os.environ['LOG_FILE'] = os.path.join(_tmp, 'app.log')
+os.environ['INGEST_LOG_FILE'] = os.path.join(_tmp, 'ingest.log')
+os.environ['DASHAPP_LOG_FILE'] = os.path.join(_tmp, 'dashapp.log')
+os.environ['REPLAY_LOG_FILE'] = os.path.join(_tmp, 'replay.log')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from utils.migrations import migrate_database
+
+SNAPSHOT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'snapshots')
+
+@pytest.fixture(scope='session', autouse=True)
+def database():
+    migrate_database()
+    return os.environ['DB_PATH']
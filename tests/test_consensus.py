@@ -0,0 +1,50 @@
+import pandas as pd
+from utils.consensus import expert_accuracy
+from utils.helper_functions import parse_espn_page
+
+def espn_page(games, experts, picks):
+    """A minimal ESPN picks page: one row per game, one logo (or empty cell) per expert."""
+    game_rows = ''.join(
+        f'<tr class="Table__TR"><td><div class="wrap-competition"><a>{game}</a></div>'
+        f'<div class="competition-dates">1:00 PM</div></td></tr>' for game in games)
+    headers = ''.join(f'<th class="Table__TH"><div>{expert}</div></th>' for expert in experts)
+    pick_rows = ''.join(
+        '<tr class="Table__TR">' + ''.join(
+            f'<td class="Table__TD"><img src="https://a.espncdn.com/i/teamlogos/nfl/500/{pick}.png"></td>' if pick
+            else '<td class="Table__TD"></td>' for pick in row) + '</tr>' for row in picks)
+    return f"""<html><body>
+<h1 class="headline headline__h1 dib">NFL Expert Picks - Week 12</h1>
+<div class="Table--fixed-left"><table><tbody class="Table__TBODY">{game_rows}</tbody></table></div>
+<div class="Table__Scroller"><table><thead class="Table__THEAD"><tr>{headers}</tr></thead>
+<tbody class="Table__TBODY">{pick_rows}</tbody></table></div>
+</body></html>"""
+
+def test_games_without_picks_are_skipped():
+    html = espn_page(['KC @ BUF', 'DAL @ NYG', 'SF @ GB'], ['A', 'B', 'C'],
+                     [['kc', 'kc', 'buf'], [None, None, None], ['sf', 'gb', None]])
+    df = parse_espn_page(html)
+
+    assert list(df['Game']) == ['KC @ BUF', 'SF @ GB']
+    assert list(df['message']) == ['66% of experts chose Chiefs', 'Experts split 50% each between 49ers and Packers']
+    assert (df['week'] == 'Week 12').all()
+
+def test_expert_accuracy_counts_decided_games_only():
+    picks_long = pd.DataFrame({
+        'week': ['Week 12'] * 5 + ['Week 13'],
+        'Game': ['KC @ BUF', 'KC @ BUF', 'SF @ GB', 'SF @ GB', 'DAL @ NYG', 'KC @ BUF'],
+        'expert': ['A', 'B', 'A', 'B', 'A', 'A'],
+        'pick': ['kc', 'buf', 'sf', 'sf', 'dal', 'buf'],
+    })
+
+    accuracy = expert_accuracy(picks_long, {'KC @ BUF': 'kc', 'SF @ GB': 'sf'})
+    assert accuracy.to_dict('records') == [
+        {'expert': 'A', 'picks': 3, 'correct': 2, 'accuracy': 2 / 3},
+        {'expert': 'B', 'picks': 2, 'correct': 1, 'accuracy': 0.5},
+    ]
+
+    # Keyed by week as well, only week 12's KC @ BUF is decided
+    accuracy = expert_accuracy(picks_long, {('Week 12', 'KC @ BUF'): 'kc'}, by=('week', 'Game'))
+    assert accuracy.to_dict('records') == [
+        {'expert': 'A', 'picks': 1, 'correct': 1, 'accuracy': 1.0},
+        {'expert': 'B', 'picks': 1, 'correct': 0, 'accuracy': 0.0},
+    ]
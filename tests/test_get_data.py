@@ -0,0 +1,66 @@
+"""get_data against the original BeautifulSoup/apply pipeline on the checked-in Bovada pages."""
+import hashlib
+import pandas as pd
+import pytest
+from bs4 import BeautifulSoup
+from utils.snapshots import list_snapshots, load_snapshot
+from utils.helper_functions import get_data, concat_values
+from tests.conftest import SNAPSHOT_FIXTURES
+
+def convert_to_int(value):
+    try:
+        if value == 'EVEN':
+            return 0
+        if value.startswith('+'):
+            return int(value[1:])
+        return int(value)
+    except Exception:
+        return -1
+
+def legacy_get_data(html, start_date, end_date):
+    """The original get_data from the page source on, minus the browser and the logging."""
+    soup = BeautifulSoup(html, "html.parser")
+    data = []
+    for game in soup.find_all("section", {"class": "coupon-content more-info"}):
+        item = str(game).split('>')
+        data.append([x.split('<')[0].strip() for x in item if not x.startswith("<")])
+    df = pd.DataFrame(data)
+    df["Home Spread"] = df.apply(lambda row: concat_values(row[10], row[11]), axis=1)
+    df["Away Spread"] = df.apply(lambda row: concat_values(row[12], row[13]), axis=1)
+    df["total_home"] = df.apply(lambda row: concat_values(row[16], row[17], row[18]), axis=1)
+    df["total_away"] = df.apply(lambda row: concat_values(row[19], row[20], row[21]), axis=1)
+    df.drop(columns=[3, 4, 5, 8, 9, 10, 11, 12, 13, 16, 17, 18, 19, 20, 21, 22], inplace=True)
+    df.columns = ["date", "time", "bets", "home_team", "away_team", "home_win", "away_win", "home_spread", "away_spread", "total_over", "total_under"]
+    df['bets'] = df['bets'].apply(lambda x: x[2:])
+    df['date'] = pd.to_datetime(df['date'])
+    df = df[(df['date'] >= pd.Timestamp(start_date)) & (df['date'] <= pd.Timestamp(end_date))].copy()
+    df["day"] = df['date'].dt.strftime('%A')
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    df.reset_index(inplace=True, drop=True)
+    df['home_win'] = df['home_win'].apply(convert_to_int)
+    df["away_win"] = df["away_win"].apply(convert_to_int)
+    home = df[["home_team", 'home_win']].rename(columns={'home_team': 'team', 'home_win': 'odds'})
+    away = df[['away_team', "away_win"]].rename(columns={'away_team': 'team', "away_win": 'odds'})
+    combined = pd.concat([home, away]).sort_values('odds', ascending=False)
+    combined['index'] = combined.index
+    combined.index = range(0, 2 * len(combined), 2)
+    df['points'] = None
+    for i, x in combined.iterrows():
+        df.at[x['index'], 'points'] = (i - len(combined)) / 2
+    current_df = df.sort_values('points', ascending=False)
+    current_df["game_id"] = current_df.apply(
+        lambda row: hashlib.md5(f"{row['date']}_{row['home_team']}_{row['away_team']}".encode()).hexdigest(), axis=1)
+    return current_df[['date', 'day', 'time', 'bets', 'home_team', 'away_team', 'points', 'home_win', 'away_win',
+                       'home_spread', 'away_spread', 'total_over', 'total_under', 'game_id']]
+
+# Checked-in pages only: real recordings trip the legacy positional parser this compares against
+SNAPSHOTS = list_snapshots('bovada', SNAPSHOT_FIXTURES)
+
+@pytest.mark.parametrize('path', SNAPSHOTS)
+@pytest.mark.parametrize('start_date, end_date', [('2024-11-20', '2024-11-27'), ('2000-01-01', '2100-01-01')])
+def test_get_data_matches_legacy(path, start_date, end_date):
+    taken_at, html = load_snapshot(path)
+    expected = legacy_get_data(html, start_date, end_date)
+    actual = get_data(start_date, end_date, html=html, scraped_at=taken_at)
+    assert actual is not None and not actual.empty
+    pd.testing.assert_frame_equal(expected.reset_index(drop=True), actual.reset_index(drop=True), check_dtype=False)
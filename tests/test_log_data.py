@@ -0,0 +1,28 @@
+from datetime import datetime
+import pandas as pd
+from utils import helper_functions
+from utils.db import get_connection
+from utils.helper_functions import log_data_if_changed
+
+def board(game_id, home_win):
+    return pd.DataFrame([{
+        'game_id': game_id, 'date': '2024-11-24', 'home_team': 'Home', 'away_team': 'Away',
+        'home_win': home_win, 'away_win': -home_win, 'points': 47.5,
+    }])
+
+def counts(game_id):
+    conn = get_connection()
+    return tuple(conn.execute(f"SELECT COUNT(*) FROM {table} WHERE game_id = ?", (game_id,)).fetchone()[0]
+                 for table in ('nfl_data', 'nfl_data_hourly', 'nfl_data_daily'))
+
+def test_rows_and_rollups_are_logged_together():
+    log_data_if_changed(board('rollup-ok', 150), scraped_at=datetime(2024, 11, 21, 12))
+    assert counts('rollup-ok') == (1, 1, 1)
+
+def test_failed_rollup_rolls_back_the_insert(monkeypatch):
+    def broken(conn, rows):
+        raise RuntimeError("rollup failed")
+    monkeypatch.setattr(helper_functions, 'update_rollups', broken)
+
+    log_data_if_changed(board('rollup-broken', 150), scraped_at=datetime(2024, 11, 21, 12))
+    assert counts('rollup-broken') == (0, 0, 0)
@@ -0,0 +1,74 @@
+import logging
+import pytest
+import queue
+import sys
+import threading
+import time
+from logger import DuplicateExceptionFilter, NonBlockingQueueHandler
+
+def exception_record(msg):
+    try:
+        raise ValueError(msg)
+    except ValueError:
+        return logging.LogRecord('test', logging.ERROR, __file__, 1, msg, None, sys.exc_info())
+
+class Captured(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+@pytest.fixture
+def captured():
+    handler = Captured()
+    logging.getLogger('test').addHandler(handler)
+    yield handler.messages
+    logging.getLogger('test').removeHandler(handler)
+
+def test_repeats_are_reported_in_every_window(captured):
+    duplicates = DuplicateExceptionFilter(window=0.1)
+    let_through = []
+    for cycle in range(4):
+        for _ in range(5):
+            record = exception_record("boom")
+            if duplicates.filter(record):
+                let_through.append(record.getMessage())
+        time.sleep(0.12)
+
+    assert let_through == ["boom"] + ["boom (repeated 4 more times in the last 0.1s)"] * 3
+    # Any later record reports the last window rather than leaving it for shutdown
+    assert duplicates.filter(logging.makeLogRecord({'name': 'test', 'msg': 'tick'}))
+    assert captured == ["boom (repeated 4 more times in the 0.1s after it was logged)"]
+    assert duplicates.summaries() == []
+
+def test_expired_windows_are_pruned_and_reported(captured):
+    duplicates = DuplicateExceptionFilter(window=0.05)
+    assert duplicates.filter(exception_record("repeated"))
+    assert not duplicates.filter(exception_record("repeated"))
+    for i in range(50):
+        assert duplicates.filter(exception_record(f"one-off {i}"))
+    assert len(duplicates._seen) == 51
+
+    time.sleep(0.06)
+    assert duplicates.filter(exception_record("after the window"))
+    assert len(duplicates._seen) == 1
+    assert captured == ["repeated (repeated 1 more times in the 0.05s after it was logged)"]
+    assert duplicates.summaries() == []
+
+def test_dropped_records_are_all_counted():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    handler.enqueue(logging.makeLogRecord({'msg': 'fills the queue'}))
+    before = NonBlockingQueueHandler.dropped
+
+    def flood():
+        for _ in range(2000):
+            handler.enqueue(logging.makeLogRecord({'msg': 'dropped'}))
+
+    threads = [threading.Thread(target=flood) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert NonBlockingQueueHandler.dropped - before == 8000
@@ -0,0 +1,59 @@
+import pytest
+import urllib3
+from utils.metrics import Histogram, add_collector, render, serve_metrics, timed
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('test_seconds', 'Test durations.', 'stage', buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value, 'a')
+    histogram.observe(0.2, 'b')
+
+    assert histogram.render() == [
+        '# HELP test_seconds Test durations.',
+        '# TYPE test_seconds histogram',
+        'test_seconds_bucket{stage="a",le="0.1"} 2',
+        'test_seconds_bucket{stage="a",le="1"} 3',
+        'test_seconds_bucket{stage="a",le="+Inf"} 4',
+        'test_seconds_sum{stage="a"} 5.650000',
+        'test_seconds_count{stage="a"} 4',
+        'test_seconds_bucket{stage="b",le="0.1"} 0',
+        'test_seconds_bucket{stage="b",le="1"} 1',
+        'test_seconds_bucket{stage="b",le="+Inf"} 1',
+        'test_seconds_sum{stage="b"} 0.200000',
+        'test_seconds_count{stage="b"} 1',
+    ]
+
+def test_render_exposes_stages_errors_and_collectors():
+    @timed('test.fails')
+    def fails():
+        raise RuntimeError("boom")
+
+    with timed('test.stage'):
+        pass
+    with pytest.raises(RuntimeError):
+        fails()
+    add_collector('test_stats', lambda: {'hits': 3})
+    add_collector('test_broken', lambda: 1 / 0)
+
+    lines = render().splitlines()
+    assert '# TYPE nfl_stage_duration_seconds histogram' in lines
+    assert 'nfl_stage_duration_seconds_count{stage="test.stage"} 1' in lines
+    assert 'nfl_stage_duration_seconds_count{stage="test.fails"} 1' in lines
+    assert 'nfl_stage_errors_total{stage="test.fails"} 1' in lines
+    assert 'nfl_test_stats{key="hits"} 3' in lines
+    # A failing collector still gets its header, just no values
+    assert '# TYPE nfl_test_broken gauge' in lines
+
+def test_serve_metrics():
+    server = serve_metrics(port=0, host='127.0.0.1')
+    try:
+        http = urllib3.PoolManager()
+        url = f"http://127.0.0.1:{server.server_port}"
+        response = http.request('GET', f"{url}/metrics")
+        assert response.status == 200
+        assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        assert b'# TYPE nfl_stage_duration_seconds histogram' in response.data
+        assert http.request('GET', f"{url}/other").status == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,23 @@
+from utils import helper_functions, providers
+from utils.helper_functions import load_expert_data, load_latest_data
+
+def broken_connection():
+    raise RuntimeError("database is locked")
+
+def test_failed_loads_return_none(monkeypatch):
+    monkeypatch.setattr(helper_functions, 'get_connection', broken_connection)
+    assert load_latest_data('2024-11-20', '2024-11-27') is None
+    assert load_expert_data() is None
+
+def test_failed_loads_are_not_cached(monkeypatch):
+    for provider in (providers.latest_odds, providers.odds_table, providers.matchups, providers.expert_picks):
+        provider.cache_clear()
+    with monkeypatch.context() as patch:
+        patch.setattr(helper_functions, 'get_connection', broken_connection)
+        assert providers.expert_picks() is None
+        assert providers.odds_table('2024-11-20', '2024-11-27') is None
+        assert providers.matchups('2024-11-20', '2024-11-27') is None
+
+    # The next call after the database recovers reads it again
+    assert providers.expert_picks() is not None
+    assert providers.odds_table('2024-11-20', '2024-11-27') is not None
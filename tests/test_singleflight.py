@@ -0,0 +1,52 @@
+import threading
+import time
+from utils import helper_functions
+from utils.helper_functions import get_data
+from utils.singleflight import SingleFlight
+from utils.snapshots import list_snapshots, load_snapshot
+from utils.sources import Page
+from .conftest import SNAPSHOT_FIXTURES
+
+def run_concurrently(fn, callers=5):
+    results = [None] * callers
+    start = threading.Barrier(callers)
+
+    def call(i):
+        start.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight(fresh_for=0)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results = run_concurrently(lambda: flight.do('key', slow))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {'calls': 1, 'shared': 4}
+
+def test_concurrent_get_data_fetches_once(monkeypatch):
+    _, html = load_snapshot(list_snapshots('bovada', SNAPSHOT_FIXTURES)[0])
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        time.sleep(0.2)
+        return Page(html, True)
+
+    monkeypatch.setattr(helper_functions, 'fetch_bovada_page', fetch)
+    results = run_concurrently(lambda: get_data('2024-11-18', '2024-11-25'))
+    assert len(fetches) == 1
+    assert not results[0].empty
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,55 @@
+import pytest
+import urllib3
+from benchmarks.standin_server import serve
+from utils import helper_functions
+from utils.helper_functions import _get_data, _last_parsed
+from utils.sources import HttpSource
+from .conftest import SNAPSHOT_FIXTURES
+
+@pytest.fixture
+def standin():
+    server = serve(directory=SNAPSHOT_FIXTURES)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+def test_conditional_get_is_answered_with_304(standin):
+    http = urllib3.PoolManager()
+    first = http.request('GET', f"{standin}/bovada")
+    assert first.status == 200 and first.data
+    etag = first.headers['ETag']
+
+    again = http.request('GET', f"{standin}/bovada", headers={'If-None-Match': etag})
+    assert again.status == 304 and not again.data
+    since = http.request('GET', f"{standin}/bovada", headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert since.status == 304
+
+def test_http_source_reuses_the_last_body_on_304(standin):
+    source = HttpSource('bovada', f"{standin}/bovada")
+    first = source.fetch()
+    second = source.fetch()
+    assert first.changed and not second.changed
+    assert second.html == first.html
+    assert source.stats() == {'changed': 1, 'not_modified': 1}
+
+    source.invalidate()
+    assert source.fetch().changed
+
+def test_unlogged_page_is_parsed_again(standin, monkeypatch):
+    source = HttpSource('bovada', f"{standin}/bovada")
+    monkeypatch.setattr(helper_functions, 'get_source', lambda name, ready_selector=None: source)
+    _last_parsed.pop('bovada', None)
+
+    # The insert fails: the frame is still returned, but nothing is remembered
+    with monkeypatch.context() as patch:
+        patch.setattr(helper_functions, 'log_data_if_changed', lambda df, scraped_at=None: False)
+        assert not _get_data('2024-11-18', '2024-11-25').empty
+    assert 'bovada' not in _last_parsed
+
+    # So the next fetch downloads the page again rather than getting a 304
+    logged = _get_data('2024-11-18', '2024-11-25')
+    assert source.stats() == {'changed': 2}
+    assert _last_parsed['bovada'][1] is logged
+
+    assert _get_data('2024-11-18', '2024-11-25') is logged
+    assert source.stats()['not_modified'] == 1
@@ -0,0 +1,67 @@
+from logger import setup_logger
+import lxml.html
+
+logger = setup_logger(__name__)
+
+# Every game on the board is one coupon section
+COUPON_XPATH = ("//section[contains(concat(' ', normalize-space(@class), ' '), ' coupon-content ')"
+                " and contains(concat(' ', normalize-space(@class), ' '), ' more-info ')]")
+TEAM_XPATH = ".//h4[contains(@class, 'competitor-name')]//span[contains(@class, 'name')]"
+MARKET_XPATH = ".//sp-two-way-vertical"
+
+COUPON_FIELDS = [
+    "date", "time", "bets", "home_team", "away_team", "home_win", "away_win",
+    "home_spread_line", "home_spread_price", "away_spread_line", "away_spread_price",
+    "over_side", "over_line", "over_price", "under_side", "under_line", "under_price",
+]
+
+def _tokens(element):
+    return [text.strip() for text in element.itertext() if text.strip()]
+
+def _read_market(record, tokens):
+    """Assign one market's tokens to named fields, recognising the market by its shape.
+
+    Totals are 'O line price U line price', spreads are 'line price line price' and
+    moneylines are 'price price'. A missing or suspended market leaves its fields as
+    None instead of shifting the following columns.
+    """
+    if len(tokens) == 6 and tokens[0] == 'O' and tokens[3] == 'U':
+        (record["over_side"], record["over_line"], record["over_price"],
+         record["under_side"], record["under_line"], record["under_price"]) = tokens
+    elif len(tokens) == 4:
+        (record["home_spread_line"], record["home_spread_price"],
+         record["away_spread_line"], record["away_spread_price"]) = tokens
+    elif len(tokens) == 2:
+        record["home_win"], record["away_win"] = tokens
+    elif tokens:
+        logger.warning(f"Unrecognised Bovada market: {tokens}")
+
+def parse_coupon(section):
+    """Pull the named fields of one game out of its coupon section."""
+    record = dict.fromkeys(COUPON_FIELDS)
+    # The coupon header always leads with date, time and the '+ N' bets link
+    header = _tokens(section)[:3]
+    if len(header) == 3:
+        record["date"], record["time"] = header[0], header[1]
+        record["bets"] = header[2].lstrip('+').strip()
+
+    teams = [team.text_content().strip() for team in section.xpath(TEAM_XPATH)]
+    if len(teams) == 2:
+        record["home_team"], record["away_team"] = teams
+
+    for market in section.xpath(MARKET_XPATH):
+        _read_market(record, _tokens(market))
+    return record
+
+def parse_coupons(html):
+    """Parse every game coupon on a Bovada NFL page in a single lxml pass."""
+    if not html:
+        return []
+    root = lxml.html.fromstring(html)
+    records = []
+    for section in root.xpath(COUPON_XPATH):
+        try:
+            records.append(parse_coupon(section))
+        except Exception as e:
+            logger.exception("parse coupon error")
+    return records
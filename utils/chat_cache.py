@@ -0,0 +1,54 @@
+from logger import setup_logger
+import threading
+from collections import deque
+from config import CHAT_CACHE_SIZE
+
+logger = setup_logger(__name__)
+
+class ChatRingBuffer:
+    """The newest `size` chat_messages rows of this process, oldest first.
+
+    Eviction is FIFO by message id: once `size` rows are held, every new message
+    pushes out the oldest one, so memory stays at `size` rows no matter how long
+    the chat runs. Polls that only need messages inside the buffer are answered
+    from memory; anything older falls through to SQLite.
+
+    The buffer only sees messages written through this process, which holds for
+    the single-process Dash server.
+    """
+
+    def __init__(self, size=CHAT_CACHE_SIZE):
+        self._rows = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._warm = False
+        # True while the buffer holds every message in the table
+        self._complete = False
+
+    def warm(self, rows):
+        """Load the newest rows (oldest first) read from chat_messages."""
+        with self._lock:
+            self._rows.clear()
+            self._rows.extend(rows)
+            self._complete = len(rows) < self._rows.maxlen
+            self._warm = True
+
+    def append(self, row):
+        with self._lock:
+            if not self._warm:
+                return
+            if len(self._rows) == self._rows.maxlen:
+                self._complete = False
+            self._rows.append(row)
+
+    def since(self, after_id, limit):
+        """Newest `limit` rows with an id above `after_id`, or None if the buffer can't tell."""
+        with self._lock:
+            if not self._warm:
+                return None
+            newer = [row for row in self._rows if row[0] > after_id]
+            covers_gap = self._complete or (self._rows and self._rows[0][0] <= after_id)
+            if covers_gap or len(newer) >= limit:
+                return newer[-limit:] if limit else []
+            return None
+
+chat_cache = ChatRingBuffer()
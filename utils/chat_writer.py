@@ -0,0 +1,153 @@
+from logger import setup_logger
+import atexit
+import queue
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from config import CHAT_BATCH_SIZE, CHAT_FLUSH_INTERVAL, CHAT_QUEUE_MAX, CHAT_RATE, CHAT_BURST
+from .db import get_connection
+from .chat_cache import chat_cache
+
+logger = setup_logger(__name__)
+
+# queued / written / batches / dropped / failed / throttled
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+def _count(name, n=1):
+    with _stats_lock:
+        _stats[name] += n
+
+def chat_stats():
+    """Snapshot of the chat write and rate-limit counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+class ChatWriter:
+    """Write-behind queue that commits chat messages in batched transactions.
+
+    A batch is written once `batch_size` messages are waiting or the oldest of
+    them has waited `max_latency` seconds, whichever comes first. Messages are
+    dropped (and counted) while `max_queue` are already waiting.
+    """
+
+    def __init__(self, batch_size=CHAT_BATCH_SIZE, max_latency=CHAT_FLUSH_INTERVAL, max_queue=CHAT_QUEUE_MAX):
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        # ip -> username given at submit time, so a burst from a new ip is not
+        # split across names before its first message reaches the table
+        self._usernames = OrderedDict()
+        self._usernames_lock = threading.Lock()
+        self.max_usernames = 10000
+
+    def username_for(self, ip_address, assign):
+        """The username remembered for ip_address, else `assign(ip_address)` (then remembered)."""
+        with self._usernames_lock:
+            username = self._usernames.get(ip_address)
+            if username is None:
+                username = self._usernames[ip_address] = assign(ip_address)
+            self._usernames.move_to_end(ip_address)
+            while len(self._usernames) > self.max_usernames:
+                self._usernames.popitem(last=False)
+            return username
+
+    def submit(self, ip_address, username, message):
+        """Queue a message; returns False if it was dropped."""
+        self._start()
+        try:
+            self._queue.put_nowait((ip_address, username, message, datetime.now().isoformat()))
+        except queue.Full:
+            _count('dropped')
+            logger.warning(f"Chat queue full, dropped message from {ip_address}")
+            return False
+        _count('queued')
+        return True
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='chat-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _next_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            self._write(self._next_batch(self._queue.get()))
+
+    def _write(self, batch):
+        try:
+            written = []
+            # One transaction (and one fsync) for the whole batch
+            with get_connection() as conn:
+                for ip_address, username, message, timestamp in batch:
+                    cursor = conn.execute(
+                        "INSERT INTO chat_messages (ip, username, message, timestamp) VALUES (?, ?, ?, ?)",
+                        (ip_address, username, message, timestamp))
+                    written.append((cursor.lastrowid, ip_address, username, message, timestamp))
+            for row in written:
+                chat_cache.append(row)
+            _count('written', len(written))
+            _count('batches')
+        except Exception as e:
+            _count('failed', len(batch))
+            logger.exception("chat batch write")
+
+    def flush(self):
+        """Write everything still queued from the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+class RateLimiter:
+    """Token bucket per key: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate=CHAT_RATE, burst=CHAT_BURST, max_keys=10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+        if not allowed:
+            _count('throttled')
+        return allowed
+
+    def _prune(self, now):
+        # Buckets that have refilled completely behave exactly like new ones
+        for key, (tokens, last) in list(self._buckets.items()):
+            if tokens + (now - last) * self.rate >= self.burst:
+                del self._buckets[key]
+
+chat_writer = ChatWriter()
+chat_limiter = RateLimiter()
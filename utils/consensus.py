@@ -0,0 +1,53 @@
+from logger import setup_logger
+import pandas as pd
+from .helper_data import espn_team_names
+
+logger = setup_logger(__name__)
+
+def picks_to_long(df, experts, id_vars=('Game',)):
+    """Reshape one-column-per-expert picks into one row per (game, expert, pick).
+
+    Missing picks (no team logo) are dropped. Keep extra identifiers such as the
+    week or season in `id_vars` to stack several weeks into one history.
+    """
+    long_df = df.melt(id_vars=list(id_vars), value_vars=list(experts), var_name='expert', value_name='pick')
+    return long_df.dropna(subset=['pick'])
+
+def compute_consensus(picks_long, by=('Game',), team_names=espn_team_names):
+    """Most picked team, its share of the votes and ties for every game in one grouped pass.
+
+    Returns one row per game with `pick` (the first expert's choice among the
+    leaders when tied), `votes`, `pct` (floored percentage), `tied` (number of
+    teams sharing the lead) and a display `message`.
+    """
+    by = list(by)
+    counts = picks_long.groupby(by + ['pick'], sort=False).size().rename('votes').reset_index()
+    grouped = counts.groupby(by, sort=False)['votes']
+    counts['total'] = grouped.transform('sum')
+    leaders = counts[counts['votes'] == grouped.transform('max')]
+
+    consensus = leaders.groupby(by, sort=False).agg(
+        pick=('pick', 'first'), votes=('votes', 'first'), total=('total', 'first'),
+        tied=('pick', 'size'), leaders=('pick', list)).reset_index()
+    consensus['pct'] = (consensus['votes'] * 100 // consensus['total']).astype(int)
+
+    names = consensus['leaders'].map(lambda picks: [team_names.get(pick, pick) for pick in picks])
+    single = consensus['pct'].astype(str) + '% of experts chose ' + names.str[0]
+    split = 'Experts split ' + consensus['pct'].astype(str) + '% each between ' + names.str.join(' and ')
+    consensus['message'] = single.where(consensus['tied'] == 1, split)
+    return consensus.drop(columns=['leaders'])
+
+def expert_accuracy(picks_long, winners, by=('Game',)):
+    """Per-expert record once results are known.
+
+    `winners` maps each game (or tuple of `by` keys) to the winning team's ESPN
+    abbreviation; games without a result yet are ignored. Nothing calls this
+    until a results source is wired in.
+    """
+    by = list(by)
+    keys = picks_long[by[0]] if len(by) == 1 else pd.Series(list(zip(*(picks_long[col] for col in by))), index=picks_long.index)
+    winner = keys.map(winners)
+    decided = picks_long.assign(correct=picks_long['pick'] == winner)[winner.notna()]
+    accuracy = decided.groupby('expert')['correct'].agg(picks='size', correct='sum').reset_index()
+    accuracy['accuracy'] = accuracy['correct'] / accuracy['picks']
+    return accuracy.sort_values('accuracy', ascending=False, ignore_index=True)
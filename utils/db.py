@@ -0,0 +1,78 @@
+from logger import setup_logger
+import queue
+import sqlite3
+import threading
+from config import DB_PATH, DB_BUSY_TIMEOUT, DB_POOL_SIZE
+
+logger = setup_logger(__name__)
+
+_local = threading.local()
+
+def connect(path=DB_PATH, **kwargs):
+    """Open a connection with the pragmas every reader and writer should share.
+
+    WAL lets the dashboard keep reading while the ingestion worker writes;
+    synchronous=NORMAL is durable under WAL and skips an fsync per commit.
+    """
+    conn = sqlite3.connect(path, timeout=DB_BUSY_TIMEOUT / 1000, cached_statements=256, **kwargs)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT}")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class ConnectionPool:
+    """Idle connections handed from finished threads to new ones.
+
+    The threaded dev server runs each request on a fresh thread, so a purely
+    thread-local connection would be opened (and its pragmas set) per request and
+    never reused. At most `size` idle connections are kept; extras are closed.
+    """
+
+    def __init__(self, size=DB_POOL_SIZE):
+        self._idle = queue.LifoQueue(maxsize=size)
+        self.opened = 0
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            self.opened += 1
+            # Leased to one thread at a time, but may move between threads over its life
+            return connect(check_same_thread=False)
+
+    def release(self, conn):
+        try:
+            # Never hand on an open transaction
+            conn.rollback()
+            self._idle.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn.close()
+
+_pool = ConnectionPool()
+
+class _Lease:
+    """Holds a pooled connection for one thread; returns it when the thread's locals are cleared."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __del__(self):
+        _pool.release(self.conn)
+
+def get_connection():
+    """Return this thread's connection to DB_PATH, leasing one from the pool on first use.
+
+    The connection stays with the thread for its life and goes back to the pool
+    when the thread ends, so the statement cache is reused across calls and
+    across request threads. Use it as `with get_connection() as conn:` to commit
+    (or roll back) a transaction without closing the connection.
+    """
+    lease = getattr(_local, 'lease', None)
+    if lease is None:
+        lease = _local.lease = _Lease(_pool.acquire())
+    return lease.conn
+
+def sqlite_values(df, columns):
+    """df[columns] ready for executemany: numpy scalars as plain Python values, NaN as None (NULL)."""
+    rows = df[columns].astype(object)
+    return rows.where(rows.notna(), None)
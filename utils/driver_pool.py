@@ -0,0 +1,164 @@
+from logger import setup_logger
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from config import DRIVER_POOL_SIZE, DRIVER_MAX_PAGES, PAGE_LOAD_MODE, PAGE_LOAD_TIMEOUT, BLOCK_RESOURCES
+
+logger = setup_logger(__name__)
+
+# Requests the parsers never need; blocked through the DevTools protocol
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.css",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*scorecardresearch.com*", "*optimizely.com*",
+]
+
+def chrome_options(block_resources=BLOCK_RESOURCES):
+    """Headless Chrome options shared by every scraper."""
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")  # This line can be important in certain environments
+    options.set_capability('goog:loggingPrefs', {'browser': 'SEVERE'})
+    # Hand back control once the DOM is parsed; readiness is decided by load_page
+    options.page_load_strategy = 'eager'
+    if block_resources:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+        })
+    return options
+
+def load_page(driver, url, ready_selector, timeout=PAGE_LOAD_TIMEOUT, mode=PAGE_LOAD_MODE):
+    """Load `url` and return its page source once `ready_selector` is in the DOM.
+
+    With mode 'sleep' the old fixed 10 second wait is used instead. If the selector
+    does not show up within `timeout` the partially rendered source is returned and
+    left to the parser.
+    """
+    driver.get(url)
+    if mode == 'sleep':
+        time.sleep(10)
+        driver.implicitly_wait(10)
+    else:
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector)))
+        except TimeoutException:
+            logger.warning(f"{url} not ready after {timeout}s waiting for {ready_selector}")
+    return driver.page_source
+
+class DriverPool:
+    """Keeps up to `size` warm Chrome drivers alive and lends them out to scrape jobs.
+
+    A driver is recycled (quit and replaced) after `max_pages` page loads, when it
+    fails its health check, or when the job using it raises.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_pages=DRIVER_MAX_PAGES, block_resources=BLOCK_RESOURCES):
+        self.size = size
+        self.max_pages = max_pages
+        self.block_resources = block_resources
+        self._idle = queue.LifoQueue()
+        self._pages = {}
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _create(self):
+        driver = webdriver.Chrome(options=chrome_options(self.block_resources))
+        if self.block_resources:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+            except Exception as e:
+                logger.exception("Driver pool could not block resources")
+        self._pages[id(driver)] = 0
+        logger.info("Driver pool started a new Chrome instance")
+        return driver
+
+    def _discard(self, driver):
+        self._pages.pop(id(driver), None)
+        with self._lock:
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.exception("Driver pool quit error")
+
+    def _healthy(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            return False
+
+    def acquire(self, timeout=None):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._create()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                driver = self._idle.get(timeout=timeout)
+            if self._healthy(driver):
+                return driver
+            logger.warning("Driver pool recycling an unhealthy Chrome instance")
+            self._discard(driver)
+
+    def release(self, driver, broken=False):
+        self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+        if broken or self._pages[id(driver)] >= self.max_pages:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        """Borrow a driver for one page load: `with pool.driver() as driver: ...`"""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, broken=True)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """Return the process-wide driver pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
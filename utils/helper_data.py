@@ -40,4 +40,15 @@ no_data = [
         {"letter": 'A2', "x": 18, "y":0},
         {"letter": 'A3', "x": 16.5, "y":1.5},
         {"letter": 'A3', "x": 17.5, "y":1.5},
-    ]
\ No newline at end of file
+    ]
+
+# ESPN logo abbreviation -> team nickname, for the expert picks messages
+espn_team_names = {
+    "ari": "Cardinals", "atl": "Falcons", "bal": "Ravens", "buf": "Bills", "car": "Panthers",
+    "chi": "Bears", "cin": "Bengals", "cle": "Browns", "dal": "Cowboys", "den": "Broncos",
+    "det": "Lions", "gb": "Packers", "hou": "Texans", "ind": "Colts", "jax": "Jaguars",
+    "kc": "Chiefs", "lv": "Raiders", "lac": "Chargers", "lar": "Rams", "mia": "Dolphins",
+    "min": "Vikings", "ne": "Patriots", "no": "Saints", "nyg": "Giants", "nyj": "Jets",
+    "phi": "Eagles", "pit": "Steelers", "sf": "49ers", "sea": "Seahawks", "tb": "Buccaneers",
+    "ten": "Titans", "wsh": "Commanders",
+}
@@ -1,8 +1,10 @@
 from logger import setup_logger
 import pandas as pd
+import numpy as np
 import json
 import plotly.express as px
 import plotly.graph_objects as go
+from dash import Patch, no_update
 import hashlib
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -12,65 +14,158 @@ from datetime import datetime, timedelta
 import time
 import random
 from .helper_data import animals, colors, no_data
+from .consensus import picks_to_long, compute_consensus
+from .snapshots import save_snapshot
+from .bovada import parse_coupons, COUPON_FIELDS
+from .db import get_connection, sqlite_values
+from .chat_cache import chat_cache
+from .chat_writer import chat_writer
+from .series import reduce_series
+from .rollups import update_rollups, rollup_counts, load_rollup
+from .singleflight import scrape_flight
+from .sources import get_source
+from .metrics import timed
+from config import RECORD_SNAPSHOTS, CHAT_WINDOW, CHAT_PAGE_SIZE, CHAT_CACHE_SIZE, GRAPH_POINT_BUDGET, HISTORY_ROW_BUDGET
 import sqlite3
 
 logger = setup_logger(__name__)
 
+# Elements each parser needs before the page source is worth reading
+BOVADA_READY_SELECTOR = "section.coupon-content.more-info"
+ESPN_READY_SELECTOR = ".Table__Scroller .Table__TBODY .Table__TR"
+# (arguments, parsed frame) of the last live fetch per source, reused while its page is unchanged
+_last_parsed = {}
+
+def _insert_rows(conn, table, df, columns):
+    """executemany INSERT of df's rows; no commit, so it joins the caller's transaction."""
+    rows = sqlite_values(df, columns)
+    names = ', '.join(f'"{column}"' for column in columns)
+    placeholders = ', '.join('?' * len(columns))
+    conn.executemany(f"INSERT INTO {table} ({names}) VALUES ({placeholders})", rows.itertuples(index=False, name=None))
+
 def insert_data_to_db(df, conn):
+    """Append rows to nfl_data inside the caller's transaction; errors are left to the caller."""
+    _insert_rows(conn, 'nfl_data', df, NFL_DATA_COLUMNS)
+
+NFL_DATA_COLUMNS = ['datetime', 'game_id', 'date', 'home_team', 'away_team', 'home_win', 'away_win', 'points']
+# Only a move in these fields is worth a new nfl_data row
+ODDS_FIELDS = ['home_win', 'away_win', 'points']
+
+@timed('db.log_data_if_changed')
+def log_data_if_changed(current_df, scraped_at=None):
+    """Insert the games whose odds or points moved since their latest logged snapshot.
+
+    The latest row of every incoming game is fetched in one query, compared on
+    ODDS_FIELDS only, and all changed or new games are inserted in one transaction
+    together with their hourly/daily rollup updates. Returns False if nothing
+    could be logged.
+    """
     try:
-        df.to_sql('nfl_data', conn, if_exists='append', index=False)
+        if current_df.empty:
+            return True
+        timestamp = (scraped_at or datetime.now()).isoformat()
+        game_ids = current_df['game_id'].tolist()
+        placeholders = ','.join('?' * len(game_ids))
+        with get_connection() as conn:
+            latest = pd.read_sql_query(f"""
+                SELECT game_id, home_win, away_win, points FROM (
+                    SELECT game_id, home_win, away_win, points,
+                           ROW_NUMBER() OVER (PARTITION BY game_id ORDER BY datetime DESC, rowid DESC) AS rn
+                    FROM nfl_data
+                    WHERE game_id IN ({placeholders})
+                ) WHERE rn = 1
+            """, conn, params=game_ids)
+
+            merged = current_df.merge(latest, on='game_id', how='left', suffixes=('', '_last'), indicator=True)
+            changed = merged['_merge'] == 'left_only'
+            for col in ODDS_FIELDS:
+                current = pd.to_numeric(merged[col], errors='coerce')
+                last = pd.to_numeric(merged[f'{col}_last'], errors='coerce')
+                changed |= (current != last) & ~(current.isna() & last.isna())
+
+            games_to_insert = merged.loc[changed].assign(datetime=timestamp)[NFL_DATA_COLUMNS]
+            if not games_to_insert.empty:
+                # Neither step commits or catches, so `with conn:` commits both or rolls both back
+                insert_data_to_db(games_to_insert, conn)
+                update_rollups(conn, games_to_insert)
+                logger.info(f"Logged {len(games_to_insert)} of {len(current_df)} games with line movement")
+        return True
     except Exception as e:
-        logger.exception("insert_data_to_db")
+        logger.exception("log_data_if_changed")
+        return False
+
+def get_start_end():
+    """Return the current pick'em week (Tuesday to Monday) as 'YYYY-MM-DD' strings."""
+    today = datetime.now()
+    weekday = today.weekday()  # Monday is 0 and Sunday is 6
+
+    # Calculate the start date (Tuesday)
+    if weekday >= 1:  # If today is Tuesday or after
+        start_date = today - timedelta(days=(weekday - 1))
+    else:  # If today is before Tuesday
+        start_date = today - timedelta(days=(weekday + 6))
+
+    # Calculate the end date (Monday)
+    if weekday <= 0:  # If today is Monday
+        end_date = today
+    else:  # If today is after Monday
+        end_date = today + timedelta(days=(7 - weekday))
+
+    return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
 
+LATEST_COLUMNS = ['date', 'day', 'time', 'bets', 'home_team', 'away_team', 'points', 'home_win', 'away_win', 'home_spread', 'away_spread', 'total_over', 'total_under', 'game_id']
+EXPERT_COLUMNS = ["week", "Game", "Time", "message"]
 
-def log_data_if_changed(current_df):
+def _replace_rows(conn, table, df, columns):
+    """Swap a snapshot table's rows for df's; the caller's `with conn:` makes it one transaction."""
+    conn.execute(f"DELETE FROM {table}")
+    _insert_rows(conn, table, df, columns)
+
+def save_latest_data(df):
+    """Replace the persisted snapshot of the current Bovada board.
+
+    Delete and insert share one transaction, so readers see either the old
+    board or the new one, never an empty or missing table.
+    """
     try:
-        with sqlite3.connect('data-log.db') as conn:
-            cursor = conn.cursor()
-
-            # Initialize an empty list to collect DataFrames for concatenation
-            games_to_insert_list = []
-
-            # Iterate over each game in the current DataFrame
-            for index, game in current_df.iterrows():
-                game_id = game['game_id']
-
-                # Fetch the corresponding game data from the database by game_id
-                cursor.execute("SELECT * FROM nfl_data WHERE game_id = ?", (game_id,))
-                db_game = cursor.fetchone()
-                columns = ['datetime', 'game_id', 'date', 'home_team', 'away_team', 'home_win', 'away_win', 'points']
-
-                if db_game:
-                    # Convert db_game to DataFrame for comparison
-                    db_game_df = pd.DataFrame([db_game], columns=columns)
-
-                    # Prepare current game data for comparison
-                    current_game_df = pd.DataFrame([game], columns=columns)
-                    current_game_df['datetime'] = datetime.now().isoformat()
-
-                    # Compare with current game data
-                    if not current_game_df.equals(db_game_df):
-                        # Add to the list for bulk insertion
-                        games_to_insert_list.append(current_game_df)
-                else:
-                    # If there is no entry for this game in the database, prepare for insertion
-                    game['datetime'] = datetime.now().isoformat()
-                    games_to_insert_list.append(pd.DataFrame([game], columns=columns))
-
-            # Concatenate all DataFrames in the list for bulk insertion
-            if games_to_insert_list:
-                games_to_insert = pd.concat(games_to_insert_list, ignore_index=True)
-                insert_data_to_db(games_to_insert, conn)
+        with get_connection() as conn:
+            _replace_rows(conn, 'latest_odds', df, LATEST_COLUMNS)
     except Exception as e:
-        logger.exception("log_data_if_changed")
+        logger.exception("save_latest_data")
+
+@timed('db.load_latest_data')
+def load_latest_data(start_date, end_date):
+    """Read the latest persisted Bovada snapshot for the given date range; None if the read fails."""
+    try:
+        with get_connection() as conn:
+            df = pd.read_sql_query("SELECT * FROM latest_odds WHERE date BETWEEN ? AND ?", conn,
+                                   params=(str(start_date)[:10], str(end_date)[:10]))
+        return df.sort_values('points', ascending=False).reset_index(drop=True)
+    except Exception as e:
+        logger.exception("load_latest_data")
+
+def save_expert_data(df):
+    """Replace the persisted snapshot of the ESPN expert picks in one transaction."""
+    try:
+        with get_connection() as conn:
+            _replace_rows(conn, 'expert_picks', df, EXPERT_COLUMNS)
+    except Exception as e:
+        logger.exception("save_expert_data")
+
+@timed('db.load_expert_data')
+def load_expert_data():
+    """Read the latest persisted ESPN expert picks; None if the read fails."""
+    try:
+        with get_connection() as conn:
+            return pd.read_sql_query("SELECT * FROM expert_picks", conn)
+    except Exception as e:
+        logger.exception("load_expert_data")
 
 def get_username_by_ip(ip_address):
     try:
-        conn = sqlite3.connect('data-log.db')
-        cursor = conn.cursor()
-        cursor.execute("SELECT username FROM chat_messages WHERE ip = ?", (ip_address,))
-        result = cursor.fetchone()
-        conn.close()
+        # The first name an ip was given is the one it keeps
+        result = get_connection().execute(
+            "SELECT username FROM chat_messages WHERE ip = ? ORDER BY id LIMIT 1", (ip_address,)).fetchone()
         return result[0] if result else None
     except Exception as e:
         logger.exception("get_username_by_ip")
@@ -80,325 +175,471 @@ def generate_username(ip_address):
     random_color = random.choice(colors)
     return f"{random_animal}-{random_color}"
 
+def username_for_ip(ip_address):
+    """The ip's chat username, looked up or generated once and remembered by the chat writer."""
+    return chat_writer.username_for(ip_address, lambda ip: get_username_by_ip(ip) or generate_username(ip))
+
 def append_message_to_log(ip_address, username, message):
-    conn = sqlite3.connect('data-log.db')
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO chat_messages (ip, username, message, timestamp) VALUES (?, ?, ?, ?)",
-                   (ip_address, username, message, datetime.now().isoformat()))
-    conn.commit()
-    conn.close()
-
-def read_chat_log():
-    conn = sqlite3.connect('data-log.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM chat_messages")
-    messages = cursor.fetchall()
-    conn.close()
+    """Queue a chat message for the batched background writer."""
+    return chat_writer.submit(ip_address, username, message)
+
+def warm_chat_cache():
+    """Fill the in-memory chat buffer with the newest messages in the table."""
+    try:
+        chat_cache.warm(_read_chat_rows(0, CHAT_CACHE_SIZE))
+    except Exception as e:
+        logger.exception("warm_chat_cache")
+
+def _read_chat_rows(after_id, limit):
+    return get_connection().execute(
+        "SELECT * FROM (SELECT * FROM chat_messages WHERE id > ? ORDER BY id DESC LIMIT ?) ORDER BY id",
+        (after_id, limit)).fetchall()
+
+@timed('db.read_chat_log')
+def read_chat_log(after_id=0, limit=CHAT_WINDOW):
+    """Return the newest `limit` messages with an id above `after_id`, oldest first.
+
+    Served from the in-memory buffer when it covers the request.
+    """
+    messages = chat_cache.since(after_id, limit)
+    if messages is None:
+        messages = _read_chat_rows(after_id, limit)
     return messages
 
+def read_chat_before(before_id, limit=CHAT_PAGE_SIZE):
+    """Return the page of `limit` messages just older than `before_id`, oldest first."""
+    return get_connection().execute(
+        "SELECT * FROM (SELECT * FROM chat_messages WHERE id < ? ORDER BY id DESC LIMIT ?) ORDER BY id",
+        (before_id, limit)).fetchall()
+
 def plot_no_data():
     data = pd.DataFrame(no_data)
     # Create the line plot
     return px.line(data, color='letter', x='x', y='y', line_shape='linear')
 
-def generate_game_id(row):
-    try:
-        # Example: Use a combination of date, home team, and away team to generate a unique ID
-        identifier = f"{row['date']}_{row['home_team']}_{row['away_team']}"
-        return hashlib.md5(identifier.encode()).hexdigest()
-    except Exception as e:
-        logger.exception("Generate Game error")
-# Function to convert the betting odds to integers while handling the signs
-def convert_to_int(value):
-    try:
-        if value == 'EVEN':
-            return 0
-        if value.startswith('+'):
-            return int(value[1:])
-        elif value.startswith('-'):
-            return int(value)
-        else:
-            return int(value)
-    except Exception as e:
-        logger.exception("Convert to int error")
-        return -1
-
 def concat_values(x, y, z=None):
     if z:
         return f"{x} {y} {z}"
     return f"{x} {y}"
 
-def get_espn_expert_data():
-    try:
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")  # This line can be important in certain environments
-        options.set_capability('goog:loggingPrefs', {'browser': 'SEVERE'})
-        # Initialize the Chrome WebDriver with the specified options
-        driver = webdriver.Chrome(options=options)
-        driver.get("https://www.espn.com/nfl/picks")
-        #time.sleep(10)
-        driver.implicitly_wait(10)
-        # get the HTML source
-        html = driver.page_source
-        # create a BeautifulSoup object
-        soup = BeautifulSoup(html, "html.parser")
-        # close the driver
-        driver.quit()
-
-        week = soup.find('h1', class_='headline headline__h1 dib').get_text(strip=True).split('- ')[1]
-
-        # Extract game details
-        games = []
-        game_rows = soup.select('.Table--fixed-left .Table__TBODY .Table__TR')
-        for row in game_rows:
-            game_info_element = row.select_one('.wrap-competition a')
-            game_time_element = row.select_one('.competition-dates')
-            if game_info_element and game_time_element:
-                game_info = game_info_element.text
-                game_time = game_time_element.text
-                games.append((game_info, game_time))
-
-        # Extract expert names
-        experts = []
-        expert_headers = soup.select('.Table__Scroller .Table__THEAD .Table__TH')
-        for header in expert_headers:
-            expert_name_element = header.select_one('div')
-            if expert_name_element:
-                expert_name = expert_name_element.text.strip()
-                experts.append(expert_name)
-
-        # Extract picks
-        picks = []
-        pick_rows = soup.select('.Table__Scroller .Table__TBODY .Table__TR')
-        for row in pick_rows:
-            pick_row = []
-            pick_cells = row.select('.Table__TD')
-            for cell in pick_cells:
-                team_logo = cell.select_one('img')
-                if team_logo:
-                    # Extract the team abbreviation from the image URL
-                    team = team_logo['src'].split('/')[-1].split('.')[0]
-                else:
-                    team = None
-                pick_row.append(team)
-            picks.append(pick_row)
-
-        # Create DataFrame
-        data = {'Game': [game[0] for game in games], 'Time': [game[1] for game in games]}
-        for i, expert in enumerate(experts):
-            data[expert] = [pick[i] for pick in picks]
-
-        data['Game'].append(None)
-        data['Time'].append(None)
-
-        df = pd.DataFrame(data)
-        df.dropna(inplace=True)
-
-        df['week'] = week
-
-        convert_dict = {
-            "min": "Vikings", "phi": "Eagles", "bal": "Ravens", "det": "Lions", "mia": "Dolphins",
-            "nyj": "Jets", "atl": "Falcons", "gb": "Packers", "hou" : "Texans", "lac": "Chargers",
-            "buf": "Bills", "den": "Broncos", "kc": "Chiefs", "chi": "Bears", "sf": "49ers", "pit": "Steelers"
-        }
-
-        for ix, row in df.iterrows():
-            values = row.to_list()[2:]
-            values_len = len(values)
-            values_dict = {}
-            for value in values:
-                if value not in values_dict.keys():
-                    values_dict[value] = 1
-                else:
-                    values_dict[value] += 1
-            #sorting
-            values_dict = dict(sorted(values_dict.items(), key=lambda item: item[1], reverse=True))
-            top_key = next(iter(values_dict))
-            if top_key in convert_dict:
-                converted_key = convert_dict[top_key]
+@timed('scrape.espn.fetch')
+def fetch_espn_page():
+    """Fetch the ESPN expert picks page through its source adapter; returns a Page (html, changed)."""
+    # the selenium adapter waits for the picks table to render
+    page = get_source('espn', ESPN_READY_SELECTOR).fetch()
+    if RECORD_SNAPSHOTS and page.changed:
+        save_snapshot('espn', page.html)
+    return page
+
+@timed('scrape.espn.parse')
+def parse_espn_page(html):
+    """Build the expert picks table from an ESPN picks page source."""
+    # create a BeautifulSoup object
+    soup = BeautifulSoup(html, "html.parser")
+
+    week = soup.find('h1', class_='headline headline__h1 dib').get_text(strip=True).split('- ')[1]
+
+    # Extract game details
+    games = []
+    game_rows = soup.select('.Table--fixed-left .Table__TBODY .Table__TR')
+    for row in game_rows:
+        game_info_element = row.select_one('.wrap-competition a')
+        game_time_element = row.select_one('.competition-dates')
+        if game_info_element and game_time_element:
+            game_info = game_info_element.text
+            game_time = game_time_element.text
+            games.append((game_info, game_time))
+
+    # Extract expert names
+    experts = []
+    expert_headers = soup.select('.Table__Scroller .Table__THEAD .Table__TH')
+    for header in expert_headers:
+        expert_name_element = header.select_one('div')
+        if expert_name_element:
+            expert_name = expert_name_element.text.strip()
+            experts.append(expert_name)
+
+    # Extract picks
+    picks = []
+    pick_rows = soup.select('.Table__Scroller .Table__TBODY .Table__TR')
+    for row in pick_rows:
+        pick_row = []
+        pick_cells = row.select('.Table__TD')
+        for cell in pick_cells:
+            team_logo = cell.select_one('img')
+            if team_logo:
+                # Extract the team abbreviation from the image URL
+                team = team_logo['src'].split('/')[-1].split('.')[0]
             else:
-                converted_key = top_key
-            pct = int(values_dict[top_key]/values_len*100)
-            message = f"{pct}% of experts chose {converted_key}"
-            df.loc[ix, "pct"] = pct
-            df.loc[ix, "message"] = message
-
-        return df[["week", "Game", "Time", "message"]]
+                team = None
+            pick_row.append(team)
+        picks.append(pick_row)
+
+    # Create DataFrame: games and pick rows line up by position; trailing pick rows without a game are dropped
+    picks_df = pd.DataFrame([row[:len(experts)] for row in picks], columns=experts)
+    df = pd.concat([pd.DataFrame(games, columns=['Game', 'Time']), picks_df], axis=1)
+    df.dropna(subset=['Game'], inplace=True)
+
+    consensus = compute_consensus(picks_to_long(df, experts))
+    # Games nobody has picked yet have no consensus, so they are left out
+    df = df.merge(consensus[['Game', 'pct', 'message']], on='Game', how='inner')
+    df['week'] = week
+
+    return df[["week", "Game", "Time", "message"]]
+
+def get_espn_expert_data(html=None):
+    """Fetch (unless `html` is given) and parse the ESPN expert picks.
+
+    Live fetches go through scrape_flight: concurrent callers share one scrape
+    and its result stays fresh for SCRAPE_FRESHNESS seconds.
+    """
+    if html is None:
+        return scrape_flight.do(('espn',), _get_espn_expert_data)
+    return _get_espn_expert_data(html)
+
+def _forget_page(source):
+    """Drop a source's parsed frame and validators, so its next fetch is downloaded and parsed again."""
+    _last_parsed.pop(source, None)
+    get_source(source).invalidate()
+
+def _get_espn_expert_data(html=None):
+    try:
+        if html is not None:
+            return parse_espn_page(html)
+        page = fetch_espn_page()
+        if not page.changed and 'espn' in _last_parsed:
+            return _last_parsed['espn'][1]
+        df = parse_espn_page(page.html)
+        _last_parsed['espn'] = ((), df)
+        return df
     except Exception as e:
         logger.exception("get espn data")
-    
-def get_data(start_date, end_date):
+        if html is None:
+            # The page was fetched but not parsed; an unchanged answer next time must not skip it
+            _forget_page('espn')
+
+@timed('scrape.bovada.fetch')
+def fetch_bovada_page():
+    """Fetch the Bovada NFL board through its source adapter; returns a Page (html, changed)."""
+    # the selenium adapter waits for the game coupons to render
+    page = get_source('bovada', BOVADA_READY_SELECTOR).fetch()
+    if RECORD_SNAPSHOTS and page.changed:
+        save_snapshot('bovada', page.html)
+    return page
+
+def join_fields(df, columns):
+    """Vectorized concat_values: 'x y', or 'x y z' where the third field is set."""
+    joined = np.char.add(np.char.add(df[columns[0]].to_numpy().astype(str), ' '),
+                         df[columns[1]].to_numpy().astype(str))
+    if len(columns) == 3:
+        third = df[columns[2]].to_numpy()
+        has_third = np.fromiter((bool(value) for value in third), dtype=bool, count=len(third))
+        joined = np.where(has_third, np.char.add(np.char.add(joined, ' '), third.astype(str)), joined)
+    return pd.Series(joined.astype(object), index=df.index)
+
+def odds_to_int(values):
+    """Moneyline strings as integers: 'EVEN' is 0, '+150' is 150 and anything unreadable is -1.
+
+    Unreadable values are reported in one warning per call instead of a traceback per cell.
+    """
+    text = values.astype(str).str.strip()
+    text = text.mask(text == 'EVEN', '0')
+    valid = text.str.fullmatch(r'[+-]?\d+')
+    if not valid.all():
+        logger.warning(f"{(~valid).sum()} unreadable odds set to -1: {sorted(set(text[~valid]))[:5]}")
+    return pd.to_numeric(text.where(valid), errors='coerce').fillna(-1).astype(int)
+
+def rank_points(df):
+    """Pick'em points per game from the moneylines.
+
+    All teams are ranked by odds, highest first, and each gets its position minus
+    half the field; a game takes the value of its lower-ranked (favoured) team.
+    """
+    odds = pd.Series(np.concatenate([df['home_win'].to_numpy(), df['away_win'].to_numpy()]))
+    games = np.tile(np.arange(len(df)), 2)
+    order = odds.sort_values(ascending=False).index.to_numpy()
+    points = np.full(len(df), -np.inf)
+    np.maximum.at(points, games[order], np.arange(len(order)) - len(order) / 2)
+    return pd.Series(points, index=df.index)
+
+def coupons_to_frame(records, start_date, end_date):
+    """Turn parsed Bovada coupons into the ranked odds table for games between start_date and end_date."""
+    df = pd.DataFrame(records, columns=COUPON_FIELDS)
+
+    df["home_spread"] = join_fields(df, ["home_spread_line", "home_spread_price"])
+    df["away_spread"] = join_fields(df, ["away_spread_line", "away_spread_price"])
+    df["total_over"] = join_fields(df, ["over_side", "over_line", "over_price"])
+    df["total_under"] = join_fields(df, ["under_side", "under_line", "under_price"])
+    columns = ["date", "time", "bets", "home_team", "away_team", "home_win", "away_win", "home_spread", "away_spread", "total_over", "total_under"]
+    df = df[columns]
+
+    #date operations
+    #filter data for date
+    if isinstance(start_date, str):
+        start_date = datetime.strptime(start_date, '%Y-%m-%d')  # Adjust the format if needed
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date, '%Y-%m-%d')  # Adjust the format if needed
+
+    dates = pd.to_datetime(df['date'])
+    in_range = (dates >= start_date) & (dates <= end_date)
+    df, dates = df[in_range].reset_index(drop=True), dates[in_range].reset_index(drop=True)
+    df = df.assign(
+        date=dates.dt.strftime('%Y-%m-%d'),
+        day=dates.dt.strftime('%A'),  # day of the week
+        home_win=odds_to_int(df['home_win']),
+        away_win=odds_to_int(df['away_win']),
+    )
+    df['points'] = rank_points(df)
+    current_df = df.sort_values('points', ascending=False)
+    #add game id
+    keys = current_df['date'] + '_' + current_df['home_team'].astype(str) + '_' + current_df['away_team'].astype(str)
+    current_df["game_id"] = [hashlib.md5(key.encode()).hexdigest() for key in keys]
+    #change column order
+    current_df = current_df[['date', 'day', 'time', 'bets', 'home_team', 'away_team', 'points', 'home_win', 'away_win', 'home_spread', 'away_spread', 'total_over', 'total_under', 'game_id']]
+    return current_df
+
+@timed('scrape.bovada.parse')
+def parse_bovada_page(html, start_date, end_date):
+    """Build the ranked odds table for games between start_date and end_date from a Bovada page source."""
+    # one lxml pass over the coupons, fields pulled by name
+    return coupons_to_frame(parse_coupons(html), start_date, end_date)
+
+def get_data(start_date, end_date, html=None, scraped_at=None):
+    """Fetch (unless `html` is given), parse and log the Bovada odds.
+
+    `scraped_at` stamps the logged rows; it defaults to now and is set when
+    replaying recorded snapshots. Live fetches go through scrape_flight, so
+    concurrent callers for the same range share one scrape and one insert into
+    nfl_data, and the result stays fresh for SCRAPE_FRESHNESS seconds.
+    """
+    if html is None:
+        return scrape_flight.do(('bovada', str(start_date), str(end_date)), _get_data, start_date, end_date,
+                                scraped_at=scraped_at)
+    return _get_data(start_date, end_date, html, scraped_at)
+
+def _get_data(start_date, end_date, html=None, scraped_at=None):
+    live = html is None
     try:
         logger.info(f"fetching data for {start_date}-{end_date}")
-        # Configure ChromeOptions for headless browsing
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")  # This line can be important in certain environments
-        options.set_capability('goog:loggingPrefs', {'browser': 'SEVERE'})
-        # Initialize the Chrome WebDriver with the specified options
-        driver = webdriver.Chrome(options=options)
-        driver.get("https://www.bovada.lv/sports/football/nfl")
-        # wait for the page to load
-        time.sleep(10)
-        driver.implicitly_wait(10)
-        # get the HTML source
-        html = driver.page_source
-        # create a BeautifulSoup object
-        soup = BeautifulSoup(html, "html.parser")
-        # close the driver
-        driver.quit()
-
-        data = []
-        sections = soup.find_all("section", {"class":"coupon-content more-info"})#soup.find_all("section", {"class":"coupon-content more-info"})
-        for game in sections:
-            try:
-                item = str(game).split('>')
-                info = [x.split('<')[0].strip() for x in item if not x.startswith("<")]
-                data.append(info)
-            except Exception as e:
-                logger.exception("get data section error")
-                pass
-
-        df = pd.DataFrame(data)
-
-        df["Home Spread"] = df.apply(lambda row: concat_values(row[10], row[11]), axis=1)
-        df["Away Spread"] = df.apply(lambda row: concat_values(row[12], row[13]), axis=1)
-        df["total_home"] = df.apply(lambda row: concat_values(row[16], row[17], row[18]), axis=1)
-        df["total_away"] = df.apply(lambda row: concat_values(row[19], row[20], row[21]), axis=1)
-        #drop columns
-        df.drop(columns = [3, 4, 5, 8, 9, 10, 11, 12, 13, 16, 17, 18, 19, 20, 21, 22], inplace=True)
-        columns = ["date", "time", "bets", "home_team", "away_team", "home_win", "away_win", "home_spread", "away_spread", "total_over", "total_under"]
-        df.columns = columns
-
-        #remove plus from bets
-        df['bets'] = df['bets'].apply(lambda x: x[2:])
-
-        #date operations
-        #filter data for date
-        if isinstance(start_date, str):
-            start_date = datetime.strptime(start_date, '%Y-%m-%d')  # Adjust the format if needed
-        if isinstance(end_date, str):
-            end_date = datetime.strptime(end_date, '%Y-%m-%d')  # Adjust the format if needed
-            # Ensure the 'date' column in df is of type datetime.date
-        
-        # Ensure the 'date' column in df is of type datetime
-        df['date'] = pd.to_datetime(df['date'])
-
-        df = df[(df['date'] >= start_date) & (df['date'] <= end_date)]
-        #create day of the week column
-        df["day"] = df['date'].dt.strftime('%A')
-        #set back to string
-        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
-        df.reset_index(inplace=True, drop=True)
-
-        # Applying the conversion to the 'win_home' and "Away Win" columns
-        df['home_win'] = df['home_win'].apply(convert_to_int)
-        df["away_win"] = df["away_win"].apply(convert_to_int)
-        #ranking
-        home = df[["home_team", 'home_win']].rename(columns={'home_team': 'team', 'home_win': 'odds'})
-        away = df[['away_team', "away_win"]].rename(columns={'away_team': 'team', "away_win": 'odds'})
-        combined = pd.concat([home, away]).sort_values('odds', ascending=False)
-        combined['index'] = combined.index
-        combined.index = range(0, 2*len(combined), 2)
-        df['points'] = None
-        # Iterating over the combined DataFrame to assign ranks
-        for i, x in combined.iterrows():
-            df.at[x['index'], 'points'] = (i-len(combined))/2
-        current_df = df.sort_values('points', ascending=False)
-        #add game id
-        current_df["game_id"] = current_df.apply(generate_game_id, axis=1)
-        #change column order
-        current_df = current_df[['date', 'day', 'time', 'bets', 'home_team', 'away_team', 'points', 'home_win', 'away_win', 'home_spread', 'away_spread', 'total_over', 'total_under', 'game_id']]
+        key = (str(start_date), str(end_date))
+        if live:
+            page = fetch_bovada_page()
+            # Same page as last time: nothing to parse and nothing new to log
+            last = _last_parsed.get('bovada')
+            if not page.changed and last is not None and last[0] == key:
+                return last[1]
+            html = page.html
+        current_df = parse_bovada_page(html, start_date, end_date)
         log_data = current_df[['game_id', 'date', 'home_team', 'away_team', 'home_win', 'away_win', 'points']]
-        log_data_if_changed(log_data)
+        logged = log_data_if_changed(log_data, scraped_at)
 
+        if live:
+            # Only a page that was parsed and logged may be skipped when it comes back unchanged
+            if logged:
+                _last_parsed['bovada'] = (key, current_df)
+            else:
+                _forget_page('bovada')
         return current_df
     except Exception as e:
         logger.exception("get data")
+        if live:
+            _forget_page('bovada')
 
-def load_historical_data(start_date, end_date):
-    try:
-        # Connect to SQLite database
-        conn = sqlite3.connect('data-log.db')
+TOOLTIP_FIELDS = ['home_win', 'away_win', 'points']
 
-        # Convert start and end dates to datetime objects if they are not
-        if not isinstance(start_date, datetime):
-            start_date = datetime.strptime(start_date, '%Y-%m-%d')
-        if not isinstance(end_date, datetime):
-            end_date = datetime.strptime(end_date, '%Y-%m-%d')
+@timed('db.load_odds_history')
+def load_odds_history(game_ids):
+    """Every logged snapshot of the given games in one query, newest first within each game."""
+    try:
+        if not game_ids:
+            return pd.DataFrame(columns=['game_id', 'datetime'] + TOOLTIP_FIELDS)
+        placeholders = ','.join('?' * len(game_ids))
+        return pd.read_sql_query(f"""
+            SELECT game_id, datetime, home_win, away_win, points FROM nfl_data
+            WHERE game_id IN ({placeholders})
+            ORDER BY game_id, datetime DESC
+        """, get_connection(), params=list(game_ids))
+    except Exception as e:
+        logger.exception("load_odds_history")
+        return pd.DataFrame(columns=['game_id', 'datetime'] + TOOLTIP_FIELDS)
+
+@timed('table.tooltips')
+def build_tooltip_data(df, history):
+    """Odds-table tooltips: each field's current value plus its earlier distinct values.
+
+    Consecutive repeats in a game's history are collapsed and values equal to the
+    current one are left out, newest first.
+    """
+    tooltips = pd.DataFrame(index=df.index)
+    for col in TOOLTIP_FIELDS:
+        if col not in df.columns:
+            continue
+        current = df.set_index('game_id')[col].astype(str)
+        values = history[col].astype(str)
+        new_run = (values != values.shift()) | (history['game_id'] != history['game_id'].shift())
+        runs = pd.DataFrame({'game_id': history.loc[new_run, 'game_id'], 'value': values[new_run]})
+        runs = runs[runs['value'].values != runs['game_id'].map(current).values]
+        changes = runs.groupby('game_id', sort=False)['value'].agg(', '.join)
+        history_text = df['game_id'].map(changes).fillna('No changes')
+        tooltips[col] = col + ': ' + df[col].astype(str) + '\nHistory: ' + history_text
+    return tooltips.to_dict('records')
+
+HISTORY_COLUMNS = ['DateTime', 'Team', 'Win', 'Type', 'points']
+
+def history_to_long(df):
+    """Reshape nfl_data rows into one row per team per snapshot for the graphs.
+
+    The team with the lower win odds gets +points and its opponent -points.
+    Home and away rows are interleaved in snapshot order, with compact dtypes.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    date_time = pd.to_datetime(df['datetime'], format='ISO8601')
+    points = df['points'].to_numpy(dtype='float32')
+    home_points = np.where(df['home_win'].to_numpy() < df['away_win'].to_numpy(), points, -points)
+
+    home = pd.DataFrame({'DateTime': date_time, 'Team': df['home_team'], 'Win': df['home_win'],
+                         'Type': 'Home Win', 'points': home_points})
+    away = pd.DataFrame({'DateTime': date_time, 'Team': df['away_team'], 'Win': df['away_win'],
+                         'Type': 'Away Win', 'points': -home_points})
+    # Stable sort on the snapshot index puts each home row right before its away row
+    long_df = pd.concat([home, away]).sort_index(kind='stable').reset_index(drop=True)
+    return long_df.astype({'Team': 'category', 'Type': 'category',
+                           'Win': pd.to_numeric(long_df['Win'], downcast='integer').dtype})
+
+def _history_bounds(start_date, end_date):
+    # Convert start and end dates to datetime objects if they are not
+    if not isinstance(start_date, datetime):
+        start_date = datetime.strptime(start_date, '%Y-%m-%d')
+    if not isinstance(end_date, datetime):
+        end_date = datetime.strptime(end_date, '%Y-%m-%d')
+    # Format dates for SQL query
+    return start_date.strftime('%Y-%m-%d %H:%M:%S'), end_date.strftime('%Y-%m-%d %H:%M:%S')
+
+@timed('db.history_resolution')
+def history_resolution(start_date, end_date, budget=HISTORY_ROW_BUDGET):
+    """Finest of 'raw', 'hourly' and 'daily' whose rows for the range fit in `budget`.
+
+    Counted on the hourly rollup (its samples sum to the raw row count), so the
+    check stays cheap however much nfl_data holds.
+    """
+    try:
+        start, end = _history_bounds(start_date, end_date)
+        rows, samples = rollup_counts(get_connection(), 'hourly', start, end)
+        if samples <= budget:
+            return 'raw'
+        # open and close per bucket
+        if rows * 2 <= budget:
+            return 'hourly'
+        return 'daily'
+    except Exception as e:
+        logger.exception("history resolution")
+        return 'raw'
+
+@timed('db.load_historical_data')
+def load_historical_data(start_date, end_date, min_rowid=None, max_rowid=None, resolution='raw'):
+    """Long-format odds history between start_date and end_date.
+
+    `min_rowid` (exclusive) and `max_rowid` (inclusive) restrict the load to a
+    slice of nfl_data, which lets the history cache append only new rows.
+    `resolution` 'hourly' or 'daily' reads the rollups instead (open and close
+    of each bucket); rowid slices do not apply there.
+    """
+    try:
+        conn = get_connection()
+        start_date_str, end_date_str = _history_bounds(start_date, end_date)
 
-        # Format dates for SQL query
-        start_date_str = start_date.strftime('%Y-%m-%d %H:%M:%S')
-        end_date_str = end_date.strftime('%Y-%m-%d %H:%M:%S')
+        if resolution != 'raw':
+            return history_to_long(load_rollup(conn, resolution, start_date_str, end_date_str))
 
         # SQL query to load data between start_date and end_date
-        query = f'''
-        SELECT datetime, game_id, date, home_team, away_team, home_win, away_win, points 
+        query = '''
+        SELECT datetime, home_team, away_team, home_win, away_win, points
         FROM nfl_data 
-        WHERE datetime BETWEEN '{start_date_str}' AND '{end_date_str}'
+        WHERE datetime BETWEEN ? AND ?
         '''
+        params = [start_date_str, end_date_str]
+        if min_rowid is not None:
+            query += " AND rowid > ?"
+            params.append(min_rowid)
+        if max_rowid is not None:
+            query += " AND rowid <= ?"
+            params.append(max_rowid)
 
         # Execute query and fetch data
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-
-        # Process data to determine which team has the lower win odds
-        plot_data = []
-        for _, row in df.iterrows():
-            home_team = row['home_team']
-            away_team = row['away_team']
-            home_win = row['home_win']
-            away_win = row['away_win']
-            points = row['points']
-
-            if home_win < away_win:
-                home_points = points
-                away_points = -points
-            else:
-                home_points = -points
-                away_points = points
-
-            plot_data.append({
-                'DateTime': row['datetime'],
-                'Team': home_team,
-                'Win': home_win,
-                'Type': 'Home Win',
-                'points': home_points
-            })
-            plot_data.append({
-                'DateTime': row['datetime'],
-                'Team': away_team,
-                'Win': away_win,
-                'Type': 'Away Win',
-                'points': away_points
-            })
-
-        return pd.DataFrame(plot_data)
+        df = pd.read_sql_query(query, conn, params=params)
+        return history_to_long(df)
     except Exception as e:
         logger.exception("get historical data")
 
 
+# Plotly's default palette, assigned to teams in order of first appearance like px did
+TEAM_COLORS = px.colors.qualitative.Plotly
+
+def _date_label(date):
+    return datetime.strptime(date, "%Y-%m-%d").strftime("%B %d")
+
+def _team_colors(df):
+    return {team: TEAM_COLORS[i % len(TEAM_COLORS)] for i, team in enumerate(df['Team'].unique())}
+
+def _team_ranking(df):
+    """Rank of each team by its latest points, highest first."""
+    latest = df.sort_values(by='DateTime').groupby('Team', observed=True).last()
+    return {team: rank for rank, team in enumerate(latest.sort_values(by='points', ascending=False).index)}
+
+def _as_key(key):
+    return list(key) if isinstance(key, tuple) else [key]
+
+def _trace_groups(df, by, ranking=None):
+    """(key, frame) per trace from a single groupby pass, in legend order."""
+    groups = [(_as_key(key), group) for key, group in df.groupby(by, observed=True, sort=False)]
+    if ranking is not None:
+        groups.sort(key=lambda item: ranking[item[0][0]])
+    return groups
+
+def _line_figure(df, y, hover_label):
+    # Plain lists (not numpy arrays) so Patch can extend them in the browser later
+    colors = _team_colors(df)
+    ranking = _team_ranking(df)
+    # Only the change points (or an LTTB sample of them) are drawn
+    df = reduce_series(df, ['Team', 'Type'], y, GRAPH_POINT_BUDGET)
+    fig = go.Figure()
+    shown = set()
+    for key, group in _trace_groups(df, ['Team', 'Type'], ranking):
+        team = key[0]
+        fig.add_trace(go.Scatter(
+            x=group['DateTime'].tolist(),
+            y=group[y].tolist(),
+            mode='lines',
+            name=team,
+            legendgroup=team,
+            showlegend=team not in shown,
+            line={'color': colors[team]},
+            meta=key,
+            hovertemplate=f"Team={team}<br>DateTime=%{{x}}<br>{hover_label}=%{{y}}<extra></extra>"))
+        shown.add(team)
+    return fig
+
 def generate_picks_graph(df, start_date, end_date):
     try:
-        df['DateTime'] = pd.to_datetime(df['DateTime'])
-        df = df[df['points'] > 0]
+        if df.empty:
+            return plot_no_data()
+        # assign() leaves the caller's (possibly cached) frame untouched
+        df = df.assign(DateTime=pd.to_datetime(df['DateTime']))
+        df = reduce_series(df[df['points'] > 0], ['Team'], 'points', GRAPH_POINT_BUDGET)
         # Create an empty figure
         fig = go.Figure()
 
-        # Loop through each team and add a line trace
-        for team in df['Team'].unique():
-            team_df = df[df['Team'] == team]
+        # One trace per team from a single groupby pass
+        for key, team_df in _trace_groups(df, ['Team']):
+            team = key[0]
             # Adding line trace for the team
             fig.add_trace(go.Scatter(
-                x=team_df['DateTime'], 
-                y=team_df['points'], 
+                x=team_df['DateTime'].tolist(),
+                y=team_df['points'].tolist(),
                 mode='lines', 
                 name=team,
+                meta=key,
                 hovertemplate="<br>".join([
                     "Date: %{x}",
                     "Points: %{y}"
@@ -422,7 +663,7 @@ def generate_picks_graph(df, start_date, end_date):
 
         # Update layout
         fig.update_layout(
-            title=f'Top Picks for {datetime.strptime(start_date, "%Y-%m-%d").strftime("%B %d")} - {datetime.strptime(end_date, "%Y-%m-%d").strftime("%B %d")}',
+            title=f'Top Picks for {_date_label(start_date)} - {_date_label(end_date)}',
             xaxis_title="Date Time",
             yaxis_title="Points",
             legend_title="Teams",
@@ -435,28 +676,22 @@ def generate_picks_graph(df, start_date, end_date):
 
 def generate_points_graph(df, start_date, end_date):
     try:
-        df['DateTime'] = pd.to_datetime(df['DateTime'])
-        # df = df[(df['DateTime'] >= start_date) & (df['DateTime'] <= end_date)]
+        if df.empty:
+            return plot_no_data()
+        # assign() leaves the caller's (possibly cached) frame untouched
+        df = df.assign(DateTime=pd.to_datetime(df['DateTime']))
         # Check if the required columns are present
         if not {'DateTime', 'points', 'Team', 'Type'}.issubset(df.columns):
             raise ValueError("Dataframe is missing one or more required columns.")
-        # Getting the latest entry for each team
-        latest_entries = df.sort_values(by='DateTime').groupby('Team').last().reset_index()
-        # Sorting these entries by 'points'
-        sorted_teams = latest_entries.sort_values(by='points', ascending=False)['Team']
-        # Create the line chart
-        fig = px.line(df, x='DateTime', y='points', color='Team', line_group='Type', 
-                      title=f'Points for {datetime.strptime(start_date, "%Y-%m-%d").strftime("%B %d")} - {datetime.strptime(end_date, "%Y-%m-%d").strftime("%B %d")}')
-        # Reordering the legend
+        # One line per team and side, legend ordered by each team's latest points
+        fig = _line_figure(df, 'points', 'points')
         fig.update_layout(
-            title=f'Generated Points for {datetime.strptime(start_date, "%Y-%m-%d").strftime("%B %d")} - {datetime.strptime(end_date, "%Y-%m-%d").strftime("%B %d")}',
+            title=f'Generated Points for {_date_label(start_date)} - {_date_label(end_date)}',
             xaxis_title="Date Time",
             yaxis_title="Generated points",
             legend_title="Teams",
             legend={'traceorder': 'normal'}
             )
-        fig.data = tuple(sorted(fig.data, key=lambda trace: sorted_teams.tolist().index(trace.name)))
-
         return fig
     except Exception as e:
         logger.exception("ERROR generating points graph")
@@ -464,31 +699,94 @@ def generate_points_graph(df, start_date, end_date):
 
 def generate_odds_graph(df, start_date, end_date):
     try:
-        df['DateTime'] = pd.to_datetime(df['DateTime'])
-        # df = df[(df['DateTime'] >= start_date) & (df['DateTime'] <= end_date)]
-        latest_entries = df.sort_values(by='DateTime').groupby('Team').last().reset_index()
-        # Sorting these entries by 'points'
-        sorted_teams = latest_entries.sort_values(by='points', ascending=False)['Team']
-        fig = px.line(df, x='DateTime', y='Win', color='Team', line_group='Type',
-                    labels={'Win': 'Winning Points', 'DateTime': 'DateTime', 'Team': 'Team'},
-                    range_y=[df['Win'].max(), df['Win'].min()])
+        if df.empty:
+            return plot_no_data()
+        # assign() leaves the caller's (possibly cached) frame untouched
+        df = df.assign(DateTime=pd.to_datetime(df['DateTime']))
+        fig = _line_figure(df, 'Win', 'Winning Points')
         fig.update_layout(
-            title=f'Odds for {datetime.strptime(start_date, "%Y-%m-%d").strftime("%B %d")} - {datetime.strptime(end_date, "%Y-%m-%d").strftime("%B %d")}',
+            title=f'Odds for {_date_label(start_date)} - {_date_label(end_date)}',
             xaxis_title="Date Time",
             yaxis_title="Straight Up Win Odds",
+            yaxis_range=[df['Win'].max(), df['Win'].min()],
             legend_title="Teams",
             legend={'traceorder': 'normal'}
         )
-        fig.data = tuple(sorted(fig.data, key=lambda trace: sorted_teams.tolist().index(trace.name)))
         return fig
     except Exception as e:
         logger.exception("ERROR generating odds graph")
         return plot_no_data()
 
+# How each history graph is built and which traces it holds
+HISTORY_FIGURES = {
+    'picks': {'build': generate_picks_graph, 'by': ['Team'], 'y': 'points'},
+    'points': {'build': generate_points_graph, 'by': ['Team', 'Type'], 'y': 'points'},
+    'odds': {'build': generate_odds_graph, 'by': ['Team', 'Type'], 'y': 'Win'},
+}
+
+def _figure_rows(kind, df):
+    return df[df['points'] > 0] if kind == 'picks' else df
+
+def _figure_keys(kind, df):
+    """Trace keys the full figure would have, without building it."""
+    rows = _figure_rows(kind, df)
+    ranking = None if kind == 'picks' else _team_ranking(rows)
+    keys = [_as_key(key) for key in rows.groupby(HISTORY_FIGURES[kind]['by'], observed=True, sort=False).size().index]
+    if ranking is not None:
+        keys.sort(key=lambda key: ranking[key[0]])
+    return keys
+
+def _extend_figure(kind, keys, new_rows, df):
+    """Patch appending new_rows to the traces already on screen.
+
+    New snapshots go on as-is (usually one per line per tick); the next full
+    rebuild drops the flat runs among them again.
+    """
+    spec = HISTORY_FIGURES[kind]
+    index = {tuple(key): i for i, key in enumerate(keys)}
+    patched = Patch()
+    for key, group in _trace_groups(_figure_rows(kind, new_rows), spec['by']):
+        i = index[tuple(key)]
+        patched['data'][i]['x'].extend(group['DateTime'].tolist())
+        patched['data'][i]['y'].extend(group[spec['y']].tolist())
+        if kind == 'picks':
+            # Keep the logo on the end of the line
+            last_point = group.iloc[-1]
+            patched['layout']['images'][i]['x'] = last_point['DateTime']
+            patched['layout']['images'][i]['y'] = last_point['points']
+    if kind == 'odds':
+        patched['layout']['yaxis']['range'] = [df['Win'].max(), df['Win'].min()]
+    return patched
+
+def refresh_figure(kind, df, state, start_date, end_date):
+    """
+    Return (figure, state) for one of the history graphs. The figure is a Patch
+    that only appends new points when the client already shows this range with
+    the same traces, no_update when nothing changed, otherwise a full rebuild.
+    """
+    try:
+        if df.empty:
+            return HISTORY_FIGURES[kind]['build'](df, start_date, end_date), None
+        df = df.assign(DateTime=pd.to_datetime(df['DateTime']))
+        until = df['DateTime'].max()
+        if state and state['range'] == [start_date, end_date]:
+            new_rows = df[df['DateTime'] > pd.Timestamp(state['until'])]
+            if new_rows.empty:
+                return no_update, no_update
+            if _figure_keys(kind, df) == state['keys']:
+                return _extend_figure(kind, state['keys'], new_rows, df), {**state, 'until': until.isoformat()}
+        fig = HISTORY_FIGURES[kind]['build'](df, start_date, end_date)
+        keys = [list(trace.meta) for trace in fig.data]
+        return fig, {'range': [start_date, end_date], 'until': until.isoformat(), 'keys': keys}
+    except Exception as e:
+        logger.exception(f"ERROR refreshing {kind} graph")
+        return HISTORY_FIGURES[kind]['build'](df, start_date, end_date), None
+
+@timed('table.matchups')
 def generate_matchups(df):
     try:
-        # Ensure DateTime is properly formatted
-        df['DateTime'] = pd.to_datetime(df['date'])
+        # Ensure DateTime is properly formatted (on a copy, the frame may be shared)
+        df = df.assign(DateTime=pd.to_datetime(df['date']))
 
         # Sort the DataFrame by DateTime to get matchups from soonest to latest
         sorted_df = df.sort_values(by='DateTime')
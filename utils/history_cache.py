@@ -0,0 +1,72 @@
+from logger import setup_logger
+import threading
+from collections import OrderedDict, Counter
+import pandas as pd
+from config import HISTORY_CACHE_SIZE
+from .db import get_connection
+from .helper_functions import load_historical_data, history_resolution
+
+logger = setup_logger(__name__)
+
+class HistoryCache:
+    """Process-wide LRU cache of load_historical_data frames.
+
+    Entries are keyed on (start_date, end_date) and remember the max(rowid) of
+    nfl_data they were built from. A lookup with an unchanged max(rowid) returns
+    the cached frame as is; a higher one loads only the newer rows and appends
+    them. Ranges too long for raw rows are served from the hourly or daily
+    rollups (see history_resolution); those rows change in place, so such entries
+    are reloaded in full instead. Frames handed out are shared, so callers must
+    not modify them in place.
+    The least recently used range is evicted beyond `size` entries.
+    """
+
+    def __init__(self, size=HISTORY_CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._stats = Counter()
+        self._lock = threading.Lock()
+
+    def get(self, start_date, end_date):
+        key = (str(start_date), str(end_date))
+        max_rowid = get_connection().execute("SELECT MAX(rowid) FROM nfl_data").fetchone()[0] or 0
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[0] == max_rowid:
+                    self._stats['hits'] += 1
+                    return entry[1]
+
+        if entry is not None and entry[2] == 'raw' and entry[0] < max_rowid:
+            new_rows = load_historical_data(start_date, end_date, min_rowid=entry[0], max_rowid=max_rowid)
+            if new_rows is None:
+                return entry[1]
+            frame = pd.concat([entry[1], new_rows], ignore_index=True)
+            # concat of differing categories falls back to object
+            frame = frame.astype({'Team': 'category', 'Type': 'category'})
+            resolution = 'raw'
+            stat = 'extended'
+        else:
+            # Picked whenever the range is (re)loaded; a raw entry then keeps growing until evicted
+            resolution = history_resolution(start_date, end_date)
+            frame = load_historical_data(start_date, end_date, max_rowid=max_rowid, resolution=resolution)
+            if frame is None:
+                return None if entry is None else entry[1]
+            stat = 'misses' if entry is None else 'reloaded'
+
+        with self._lock:
+            self._stats[stat] += 1
+            self._entries[key] = (max_rowid, frame, resolution)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+        return frame
+
+    def stats(self):
+        """Counts of hits, misses, incremental extensions, rollup reloads and evictions."""
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+history_cache = HistoryCache()
@@ -0,0 +1,162 @@
+"""In-process timing histograms and counters, exposed in Prometheus text format.
+
+Wrap a hot-path stage to record how long it takes and whether it raised:
+
+    @timed('db.load_historical_data')
+    def load_historical_data(...): ...
+
+    with timed('figure.picks'):
+        ...
+
+Recording is a clock read, a bisect and a locked increment; nothing is
+formatted until /metrics is requested. Each process has its own metrics: the
+dashboard serves them on its Flask server (register_metrics), the ingestion
+worker on a small standalone server (serve_metrics).
+"""
+import bisect
+import functools
+import http.server
+import threading
+import time
+from flask import Response
+from config import METRICS_PORT
+
+# Seconds; spans a cached lookup up to a slow browser scrape
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Histogram:
+    """Cumulative-bucket histogram of durations per label value."""
+
+    def __init__(self, name, help, label, buckets=BUCKETS):
+        self.name = name
+        self.help = help
+        self.label = label
+        self.buckets = buckets
+        self._series = {}  # label value -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, label):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                series = self._series[label] = [0] * (len(self.buckets) + 2)
+            series[i] += 1
+            series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {label: list(values) for label, values in self._series.items()}
+        for label, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{self.label}="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{self.label}="{label}"}} {values[-1]:.6f}')
+            lines.append(f'{self.name}_count{{{self.label}="{label}"}} {cumulative}')
+        return lines
+
+class Counter:
+    """Monotonic count per label value."""
+
+    def __init__(self, name, help, label):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label, n=1):
+        with self._lock:
+            self._values[label] = self._values.get(label, 0) + n
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for label, value in sorted(values.items()):
+            lines.append(f'{self.name}{{{self.label}="{label}"}} {value}')
+        return lines
+
+STAGE_SECONDS = Histogram('nfl_stage_duration_seconds', 'Time spent in each instrumented stage.', 'stage')
+STAGE_ERRORS = Counter('nfl_stage_errors_total', 'Instrumented stages that raised.', 'stage')
+
+# name -> zero-argument callable returning {key: number}, read only when /metrics is scraped
+_collectors = {}
+
+def add_collector(name, stats):
+    """Expose an existing stats() dict (chat writer, history cache, ...) as nfl_<name>{key="..."}."""
+    _collectors[name] = stats
+
+class timed:
+    """Record a stage's duration in STAGE_SECONDS, as a decorator or a context manager."""
+
+    def __init__(self, stage):
+        self.stage = stage
+        self._started = threading.local()
+
+    def __enter__(self):
+        # A stack per thread so one instance can be reused and nested
+        stack = getattr(self._started, 'stack', None)
+        if stack is None:
+            stack = self._started.stack = []
+        stack.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        STAGE_SECONDS.observe(time.perf_counter() - self._started.stack.pop(), self.stage)
+        if exc_type is not None:
+            STAGE_ERRORS.inc(self.stage)
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
+def render():
+    """Every metric in the Prometheus text exposition format."""
+    lines = STAGE_SECONDS.render() + STAGE_ERRORS.render()
+    for name, stats in sorted(_collectors.items()):
+        metric = f"nfl_{name}"
+        lines += [f"# HELP {metric} Counters from {name}.", f"# TYPE {metric} gauge"]
+        try:
+            values = stats() or {}
+        except Exception:
+            values = {}
+        for key, value in sorted(values.items()):
+            lines.append(f'{metric}{{key="{key}"}} {value}')
+    return '\n'.join(lines) + '\n'
+
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+def register_metrics(server, path='/metrics'):
+    """Serve render() on the Flask server behind the Dash app."""
+    @server.route(path)
+    def metrics():
+        return Response(render(), mimetype=CONTENT_TYPE)
+    return metrics
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', f'{CONTENT_TYPE}; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_metrics(port=METRICS_PORT, host='0.0.0.0'):
+    """Serve render() on http://host:port/metrics from a daemon thread; returns the server."""
+    server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
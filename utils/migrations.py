@@ -0,0 +1,145 @@
+"""Versioned schema migrations for data-log.db.
+
+The schema version lives in SQLite's `PRAGMA user_version`; each entry of
+MIGRATIONS moves the database one version forward and is applied at most once,
+in its own transaction, so a live database can be evolved in place:
+
+    python -m utils.migrations            # migrate and print query plans before/after
+"""
+from logger import setup_logger
+import sqlite3
+from .db import connect
+from .rollups import ROLLUPS, schema_statements
+
+logger = setup_logger(__name__)
+
+MIGRATIONS = [
+    # 1: base tables, as created by db_setup.py
+    [
+        """CREATE TABLE IF NOT EXISTS chat_messages (
+            id INTEGER PRIMARY KEY,
+            ip TEXT NOT NULL,
+            username TEXT NOT NULL,
+            message TEXT NOT NULL,
+            timestamp TEXT NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS nfl_data (
+            datetime TEXT,
+            game_id TEXT,
+            date TEXT,
+            home_team TEXT,
+            away_team TEXT,
+            home_win INTEGER,
+            away_win INTEGER,
+            points REAL
+        )""",
+    ],
+    # 2: indexes for the hot lookups
+    [
+        # latest snapshot per game (log_data_if_changed) and per-game history (tooltips);
+        # carries the odds fields so change detection never touches the table
+        "CREATE INDEX IF NOT EXISTS idx_nfl_data_game_datetime ON nfl_data (game_id, datetime, home_win, away_win, points)",
+        # datetime range scans (load_historical_data)
+        "CREATE INDEX IF NOT EXISTS idx_nfl_data_datetime ON nfl_data (datetime)",
+        # username lookup by ip (get_username_by_ip)
+        "CREATE INDEX IF NOT EXISTS idx_chat_messages_ip ON chat_messages (ip, username)",
+    ],
+    # 3: hourly and daily rollups of nfl_data, backfilled from the existing rows
+    [statement for table, bucket in ROLLUPS.values() for statement in schema_statements(table, bucket)],
+    # 4: snapshot tables written by the ingestion worker, created up front so saving
+    # them is a DELETE + INSERT instead of to_sql(if_exists='replace') dropping the table
+    [
+        """CREATE TABLE IF NOT EXISTS latest_odds (
+            date TEXT,
+            day TEXT,
+            time TEXT,
+            bets TEXT,
+            home_team TEXT,
+            away_team TEXT,
+            points REAL,
+            home_win INTEGER,
+            away_win INTEGER,
+            home_spread TEXT,
+            away_spread TEXT,
+            total_over TEXT,
+            total_under TEXT,
+            game_id TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS expert_picks (
+            week TEXT,
+            "Game" TEXT,
+            "Time" TEXT,
+            message TEXT
+        )""",
+    ],
+]
+
+# Representative hot queries, used to report query plans
+HOT_QUERIES = {
+    "latest per game": (
+        "SELECT game_id, home_win, away_win, points FROM nfl_data WHERE game_id IN (?) ORDER BY datetime DESC",
+        ('',)),
+    "game history": ("SELECT * FROM nfl_data WHERE game_id = ? ORDER BY datetime DESC", ('',)),
+    "history range": ("SELECT * FROM nfl_data WHERE datetime BETWEEN ? AND ?", ('', '')),
+    "username by ip": ("SELECT username FROM chat_messages WHERE ip = ?", ('',)),
+    "hourly rollup range": ("SELECT COUNT(*), SUM(samples) FROM nfl_data_hourly WHERE bucket >= ? AND bucket < ?", ('', '')),
+    "daily rollup range": ("SELECT * FROM nfl_data_daily WHERE bucket >= ? AND bucket < ?", ('', '')),
+}
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    """Apply every pending migration; returns the resulting schema version."""
+    version = schema_version(conn)
+    for number, statements in enumerate(MIGRATIONS[version:], start=version + 1):
+        try:
+            conn.execute("BEGIN")
+            for statement in statements:
+                conn.execute(statement)
+            # PRAGMA does not accept bound parameters
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.execute("COMMIT")
+            logger.info(f"Applied schema migration {number}")
+        except Exception:
+            conn.execute("ROLLBACK")
+            logger.exception(f"Schema migration {number} failed")
+            raise
+    return schema_version(conn)
+
+def query_plans(conn):
+    """EXPLAIN QUERY PLAN details for each of HOT_QUERIES."""
+    plans = {}
+    for name, (query, params) in HOT_QUERIES.items():
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+            plans[name] = [row[-1] for row in rows]
+        except sqlite3.OperationalError as e:
+            plans[name] = [f"unavailable: {e}"]
+    return plans
+
+def migrate_database():
+    # isolation_level=None so the explicit BEGIN/COMMIT above control the transactions
+    conn = connect(isolation_level=None)
+    try:
+        return migrate(conn)
+    finally:
+        conn.close()
+
+def main():
+    conn = connect(isolation_level=None)
+    try:
+        before = query_plans(conn)
+        start = schema_version(conn)
+        end = migrate(conn)
+        after = query_plans(conn)
+    finally:
+        conn.close()
+    print(f"Schema version {start} -> {end}")
+    for name in HOT_QUERIES:
+        print(f"\n{name}")
+        print("  before: " + "; ".join(before[name]))
+        print("  after:  " + "; ".join(after[name]))
+
+if __name__ == '__main__':
+    main()
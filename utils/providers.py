@@ -0,0 +1,75 @@
+"""Memoized providers for the inputs the dashboard callbacks share.
+
+Every client polls the same few queries on its own timer; these keep one
+result per argument tuple for a short TTL so each callback can refresh
+independently without multiplying the database work. Results are shared
+between callers and must not be modified in place. A None result (a failed
+load) is never cached.
+"""
+from logger import setup_logger
+import functools
+import threading
+import time
+from collections import OrderedDict
+from config import ODDS_TTL, HISTORY_TTL, EXPERT_TTL
+from .helper_functions import load_latest_data, load_expert_data, load_odds_history, build_tooltip_data, generate_matchups
+from .history_cache import history_cache
+
+logger = setup_logger(__name__)
+
+def memoize(ttl, maxsize=16):
+    """Cache a function's results per positional arguments for `ttl` seconds (LRU beyond `maxsize`)."""
+    def decorator(func):
+        entries = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(args)
+                if entry is not None and entry[0] > now:
+                    entries.move_to_end(args)
+                    return entry[1]
+            result = func(*args)
+            if result is not None:
+                with lock:
+                    entries[args] = (now + ttl, result)
+                    entries.move_to_end(args)
+                    while len(entries) > maxsize:
+                        entries.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+@memoize(ODDS_TTL)
+def latest_odds(start_date, end_date):
+    """Latest persisted Bovada snapshot, sorted by points."""
+    return load_latest_data(start_date, end_date)
+
+@memoize(ODDS_TTL)
+def odds_table(start_date, end_date):
+    """(records, tooltip_data) for the odds table."""
+    df = latest_odds(start_date, end_date)
+    if df is None:
+        return None
+    # History of every game on the board in one query
+    tooltip_data = build_tooltip_data(df, load_odds_history(df['game_id'].tolist()))
+    return df.drop(columns=['game_id']).to_dict('records'), tooltip_data
+
+@memoize(ODDS_TTL)
+def matchups(start_date, end_date):
+    df = latest_odds(start_date, end_date)
+    return None if df is None else generate_matchups(df)
+
+@memoize(HISTORY_TTL)
+def history(start_date, end_date):
+    """Long-format history frame, via the rowid-aware history cache."""
+    return history_cache.get(start_date, end_date)
+
+@memoize(EXPERT_TTL, maxsize=1)
+def expert_picks():
+    """Latest persisted ESPN expert picks."""
+    return load_expert_data()
@@ -0,0 +1,111 @@
+"""Hourly and daily rollups of nfl_data for long date ranges.
+
+Each rollup table has one row per game per bucket holding the open, close, min
+and max of every odds field plus the number of snapshots. Schema migration 3
+creates and backfills them from nfl_data; log_data_if_changed keeps them current
+by upserting every row it logs, so no rollup is ever rebuilt from scratch.
+"""
+from logger import setup_logger
+import pandas as pd
+from .db import sqlite_values
+
+logger = setup_logger(__name__)
+
+ROLLUP_FIELDS = ['home_win', 'away_win', 'points']
+
+# Rollup table and bucket expression for each resolution, finest first.
+# Logged datetimes use either a space or a 'T' separator; buckets always use a space
+ROLLUPS = {
+    'hourly': ('nfl_data_hourly', "substr({dt}, 1, 10) || ' ' || substr({dt}, 12, 2) || ':00:00'"),
+    'daily': ('nfl_data_daily', "substr({dt}, 1, 10) || ' 00:00:00'"),
+}
+
+STAT_COLUMNS = [f"{field}_{stat}" for field in ROLLUP_FIELDS for stat in ('open', 'close', 'min', 'max')]
+
+def schema_statements(table, bucket):
+    """CREATE and backfill statements for one rollup table (used by migration 3)."""
+    bucket = bucket.format(dt='datetime')
+    stats = ',\n'.join(f"{column} REAL" for column in STAT_COLUMNS)
+    aggregates = ',\n'.join(
+        f"MAX(CASE WHEN rn_open = 1 THEN {field} END), MAX(CASE WHEN rn_close = 1 THEN {field} END), "
+        f"MIN({field}), MAX({field})"
+        for field in ROLLUP_FIELDS)
+    return [
+        f"""CREATE TABLE IF NOT EXISTS {table} (
+            bucket TEXT NOT NULL,
+            game_id TEXT NOT NULL,
+            home_team TEXT,
+            away_team TEXT,
+            open_datetime TEXT,
+            close_datetime TEXT,
+            {stats},
+            samples INTEGER NOT NULL,
+            PRIMARY KEY (game_id, bucket)
+        )""",
+        # bucket range scans (load_historical_data, history_resolution)
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_bucket ON {table} (bucket, samples)",
+        f"""INSERT OR REPLACE INTO {table}
+            (bucket, game_id, home_team, away_team, open_datetime, close_datetime, {', '.join(STAT_COLUMNS)}, samples)
+        SELECT bucket, game_id, MAX(home_team), MAX(away_team), MIN(datetime), MAX(datetime),
+            {aggregates},
+            COUNT(*)
+        FROM (
+            SELECT {bucket} AS bucket, *,
+                ROW_NUMBER() OVER (PARTITION BY game_id, {bucket} ORDER BY datetime, rowid) AS rn_open,
+                ROW_NUMBER() OVER (PARTITION BY game_id, {bucket} ORDER BY datetime DESC, rowid DESC) AS rn_close
+            FROM nfl_data
+        )
+        GROUP BY game_id, bucket""",
+    ]
+
+def _upsert_statement(table, bucket):
+    """Fold one nfl_data row into its bucket; rows may arrive out of order (replay.py)."""
+    values = ', '.join(f":{field}" for field in ROLLUP_FIELDS for _ in range(4))
+    # Two-argument MIN/MAX return NULL if either side is NULL; the aggregates in the backfill skip NULLs
+    updates = ',\n'.join(
+        f"{field}_open = CASE WHEN excluded.open_datetime < {table}.open_datetime THEN excluded.{field}_open ELSE {field}_open END,\n"
+        f"{field}_close = CASE WHEN excluded.close_datetime >= {table}.close_datetime THEN excluded.{field}_close ELSE {field}_close END,\n"
+        f"{field}_min = COALESCE(MIN({field}_min, excluded.{field}_min), {field}_min, excluded.{field}_min),\n"
+        f"{field}_max = COALESCE(MAX({field}_max, excluded.{field}_max), {field}_max, excluded.{field}_max)"
+        for field in ROLLUP_FIELDS)
+    return f"""
+        INSERT INTO {table}
+            (bucket, game_id, home_team, away_team, open_datetime, close_datetime, {', '.join(STAT_COLUMNS)}, samples)
+        VALUES ({bucket.format(dt=':datetime')}, :game_id, :home_team, :away_team, :datetime, :datetime, {values}, 1)
+        ON CONFLICT (game_id, bucket) DO UPDATE SET
+            {updates},
+            open_datetime = MIN(open_datetime, excluded.open_datetime),
+            close_datetime = MAX(close_datetime, excluded.close_datetime),
+            samples = samples + 1
+    """
+
+UPSERTS = {resolution: _upsert_statement(table, bucket) for resolution, (table, bucket) in ROLLUPS.items()}
+
+def update_rollups(conn, rows):
+    """Fold newly logged nfl_data rows into every rollup, inside the caller's transaction."""
+    if rows.empty:
+        return
+    records = sqlite_values(rows, ['datetime', 'game_id', 'home_team', 'away_team'] + ROLLUP_FIELDS).to_dict('records')
+    for upsert in UPSERTS.values():
+        conn.executemany(upsert, records)
+
+def rollup_counts(conn, resolution, start, end):
+    """(rollup rows, raw nfl_data rows) for buckets in [start, end)."""
+    table, _ = ROLLUPS[resolution]
+    rows, samples = conn.execute(
+        f"SELECT COUNT(*), SUM(samples) FROM {table} WHERE bucket >= ? AND bucket < ?", (start, end)).fetchone()
+    return rows, samples or 0
+
+def load_rollup(conn, resolution, start, end):
+    """nfl_data-shaped rows for buckets in [start, end): each bucket's open and, if it moved, its close."""
+    table, _ = ROLLUPS[resolution]
+    query = f"""
+        SELECT open_datetime AS datetime, home_team, away_team,
+               home_win_open AS home_win, away_win_open AS away_win, points_open AS points
+        FROM {table} WHERE bucket >= ? AND bucket < ?
+        UNION ALL
+        SELECT close_datetime, home_team, away_team, home_win_close, away_win_close, points_close
+        FROM {table} WHERE bucket >= ? AND bucket < ? AND samples > 1
+        ORDER BY datetime
+    """
+    return pd.read_sql_query(query, conn, params=(start, end, start, end))
@@ -0,0 +1,36 @@
+from logger import setup_logger
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from config import SCRAPE_TIMEOUT, DRIVER_POOL_SIZE
+
+logger = setup_logger(__name__)
+
+# Long-lived so a timed out source never blocks the caller on executor shutdown
+_executor = ThreadPoolExecutor(max_workers=max(2, DRIVER_POOL_SIZE), thread_name_prefix='scrape')
+
+def scrape_all(sources, timeouts=None):
+    """Run every scrape source concurrently and collect what finishes in time.
+
+    `sources` maps a name to a zero-argument callable. Each source gets its own
+    timeout (`timeouts[name]`, defaulting to SCRAPE_TIMEOUT), measured from the
+    moment all sources were submitted, so the whole call is bounded by the slowest
+    allowed source rather than the sum. A source that times out or raises is
+    logged and reported as None; the others are still returned.
+    """
+    timeouts = timeouts or {}
+    started = time.monotonic()
+    futures = {name: _executor.submit(fn) for name, fn in sources.items()}
+
+    results = {}
+    for name, future in futures.items():
+        remaining = started + timeouts.get(name, SCRAPE_TIMEOUT) - time.monotonic()
+        try:
+            results[name] = future.result(timeout=max(0, remaining))
+        except TimeoutError:
+            logger.warning(f"Scrape source {name} timed out")
+            results[name] = None
+        except Exception as e:
+            logger.exception(f"Scrape source {name} failed")
+            results[name] = None
+    logger.info(f"Scraped {', '.join(sources)} in {time.monotonic() - started:.1f}s")
+    return results
@@ -0,0 +1,67 @@
+from logger import setup_logger
+import numpy as np
+import pandas as pd
+
+logger = setup_logger(__name__)
+
+def change_points(df, by, columns):
+    """Keep only the first and last row of every run of unchanged `columns` within each `by` group.
+
+    Odds lines are step functions, so the rows dropped here sit on a flat
+    segment that is redrawn exactly by its two ends. The first and last row of
+    each group are always kept.
+    """
+    if df.empty:
+        return df
+    values = df[list(columns)]
+    grouped = values.groupby([df[col] for col in by], observed=True, sort=False)
+    # NaN from shift() compares unequal, which keeps the ends of every group
+    starts = (values != grouped.shift(1)).any(axis=1)
+    ends = (values != grouped.shift(-1)).any(axis=1)
+    return df[starts | ends]
+
+def lttb_indices(x, y, threshold):
+    """Positions of the points Largest-Triangle-Three-Buckets keeps out of x/y.
+
+    The first and last points are always kept; the ones in between are split
+    into threshold - 2 buckets and each bucket keeps the point forming the
+    largest triangle with the previous pick and the next bucket's average.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+def reduce_series(df, by, y, budget, x='DateTime'):
+    """Shrink a long frame of lines (one per `by` group) to roughly `budget` points.
+
+    Change points come first since they are lossless for step lines; only when
+    that still exceeds the budget is each line over its share downsampled with LTTB.
+    """
+    reduced = change_points(df, by, [y])
+    if budget is None or len(reduced) <= budget:
+        return reduced
+    groups = reduced.groupby(by, observed=True, sort=False)
+    per_line = max(budget // max(groups.ngroups, 1), 3)
+    positions = []
+    for _, idx in groups.indices.items():
+        if len(idx) > per_line:
+            xs = reduced[x].to_numpy()[idx].astype('datetime64[ns]').astype(np.int64)
+            idx = idx[lttb_indices(xs, reduced[y].to_numpy()[idx], per_line)]
+        positions.append(idx)
+    # Back in the original row order so every line stays sorted by time
+    return reduced.iloc[np.sort(np.concatenate(positions))]
@@ -0,0 +1,70 @@
+from logger import setup_logger
+import threading
+import time
+from collections import Counter
+from config import SCRAPE_FRESHNESS
+
+logger = setup_logger(__name__)
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait and get the same result (or exception). A successful, non-None
+    result keeps being handed out for `fresh_for` seconds after it finished, so
+    a burst of callers in the same window costs one call. Results are shared and
+    must not be modified in place.
+    """
+
+    def __init__(self, fresh_for=SCRAPE_FRESHNESS):
+        self.fresh_for = fresh_for
+        self._calls = {}
+        self._stats = Counter()
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.done.is_set() and time.monotonic() - call.finished_at >= self.fresh_for:
+                call = None
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats['calls'] += 1
+            else:
+                self._stats['shared' if not call.done.is_set() else 'fresh'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            call.finished_at = time.monotonic()
+            with self._lock:
+                # Failures are not worth reusing; the next caller tries again
+                if (call.error is not None or call.result is None) and self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """Counts of calls run, callers that joined one in flight and callers served a fresh result."""
+        with self._lock:
+            return dict(self._stats)
+
+# Live page scrapes, shared by every caller in the same process
+scrape_flight = SingleFlight()
@@ -0,0 +1,35 @@
+from logger import setup_logger
+import gzip
+import os
+from datetime import datetime
+from config import SNAPSHOT_DIR
+
+logger = setup_logger(__name__)
+
+TIMESTAMP_FORMAT = '%Y%m%dT%H%M%S%f'
+
+def save_snapshot(source, html, taken_at=None, directory=SNAPSHOT_DIR):
+    """Write a gzip-compressed page source to <directory>/<source>/<timestamp>.html.gz."""
+    try:
+        taken_at = taken_at or datetime.now()
+        folder = os.path.join(directory, source)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{taken_at.strftime(TIMESTAMP_FORMAT)}.html.gz")
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(html)
+        return path
+    except Exception as e:
+        logger.exception("save_snapshot")
+
+def list_snapshots(source, directory=SNAPSHOT_DIR):
+    """Paths of every recorded snapshot for a source, oldest first."""
+    folder = os.path.join(directory, source)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith('.html.gz'))
+
+def load_snapshot(path):
+    """Return (taken_at, html) for a snapshot written by save_snapshot."""
+    taken_at = datetime.strptime(os.path.basename(path).split('.')[0], TIMESTAMP_FORMAT)
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return taken_at, f.read()
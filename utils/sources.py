@@ -0,0 +1,150 @@
+"""Page sources for the scrapers.
+
+A source fetches one page and says whether it changed since its last fetch:
+
+    page = get_source('bovada').fetch()
+    if page.changed:
+        ...parse page.html...
+
+SeleniumSource renders the page in a pooled browser. HttpSource does a plain
+keep-alive GET through a shared urllib3 pool with ETag/If-Modified-Since
+validators, so an unchanged page costs a 304 and no body. Both compare a hash
+of the body with the previous one, so identical content is reported unchanged
+even when the server ignores the validators. Which one is used per source is
+set in config.py (BOVADA_ADAPTER/BOVADA_URL, ESPN_ADAPTER/ESPN_URL).
+"""
+from logger import setup_logger
+import hashlib
+import threading
+from collections import Counter, namedtuple
+import urllib3
+from config import BOVADA_ADAPTER, ESPN_ADAPTER, BOVADA_URL, ESPN_URL, HTTP_POOL_SIZE, HTTP_TIMEOUT
+from .driver_pool import get_driver_pool, load_page
+
+logger = setup_logger(__name__)
+
+# html is the latest body (the previous one when the server answered 304)
+Page = namedtuple('Page', ['html', 'changed'])
+
+class Source:
+    """Fetches one page and remembers enough about the last response to spot repeats."""
+
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+        self._html = None
+        self._digest = None
+        self._stats = Counter()
+        self._lock = threading.Lock()
+
+    def fetch(self):
+        raise NotImplementedError
+
+    def _page(self, html):
+        """Page for a freshly downloaded body, unchanged if it hashes like the last one."""
+        digest = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        with self._lock:
+            changed = digest != self._digest
+            self._html, self._digest = html, digest
+            self._stats['changed' if changed else 'same_content'] += 1
+        if not changed:
+            logger.info(f"{self.name} page content unchanged")
+        return Page(html, changed)
+
+    def invalidate(self):
+        """Forget the last page, so the next fetch downloads it again and reports it changed."""
+        with self._lock:
+            self._html = self._digest = None
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+class SeleniumSource(Source):
+    """Render the page in a pooled headless Chrome and wait for `ready_selector`."""
+
+    def __init__(self, name, url, ready_selector):
+        super().__init__(name, url)
+        self.ready_selector = ready_selector
+
+    def fetch(self):
+        # Borrow a warm Chrome instance from the driver pool
+        with get_driver_pool().driver() as driver:
+            html = load_page(driver, self.url, self.ready_selector)
+        return self._page(html)
+
+_http = None
+_http_lock = threading.Lock()
+
+def get_http_pool():
+    """The process-wide urllib3 pool; connections to each host are kept alive and reused."""
+    global _http
+    with _http_lock:
+        if _http is None:
+            _http = urllib3.PoolManager(
+                maxsize=HTTP_POOL_SIZE,
+                block=False,
+                timeout=urllib3.Timeout(total=HTTP_TIMEOUT),
+                retries=urllib3.Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+                headers={'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64)', 'Accept-Encoding': 'gzip, deflate'},
+            )
+        return _http
+
+class HttpSource(Source):
+    """Conditional GET of the raw page over a pooled, keep-alive connection."""
+
+    def __init__(self, name, url, pool=None):
+        super().__init__(name, url)
+        self.pool = pool
+        self._etag = None
+        self._last_modified = None
+
+    def fetch(self):
+        headers = {}
+        with self._lock:
+            if self._html is not None:
+                if self._etag:
+                    headers['If-None-Match'] = self._etag
+                if self._last_modified:
+                    headers['If-Modified-Since'] = self._last_modified
+        response = (self.pool or get_http_pool()).request('GET', self.url, headers=headers)
+
+        if response.status == 304:
+            with self._lock:
+                self._stats['not_modified'] += 1
+                html = self._html
+            logger.info(f"{self.name} page not modified")
+            return Page(html, False)
+        if response.status != 200:
+            raise RuntimeError(f"{self.name} fetch returned HTTP {response.status}")
+
+        with self._lock:
+            self._etag = response.headers.get('ETag')
+            self._last_modified = response.headers.get('Last-Modified')
+        return self._page(response.data.decode('utf-8', errors='replace'))
+
+    def invalidate(self):
+        super().invalidate()
+        with self._lock:
+            self._etag = self._last_modified = None
+
+# (adapter, url) per source
+SOURCES = {
+    'bovada': (BOVADA_ADAPTER, BOVADA_URL),
+    'espn': (ESPN_ADAPTER, ESPN_URL),
+}
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+def get_source(name, ready_selector=None):
+    """The shared source for `name`, built on first use with the configured adapter."""
+    with _sources_lock:
+        if name not in _sources:
+            adapter, url = SOURCES[name]
+            if adapter == 'http':
+                _sources[name] = HttpSource(name, url)
+            else:
+                _sources[name] = SeleniumSource(name, url, ready_selector)
+            logger.info(f"Using {adapter} adapter for {name}")
+        return _sources[name]